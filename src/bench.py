@@ -0,0 +1,336 @@
+#! /usr/bin/env python3
+
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import subprocess
+import sys
+import time
+
+# collect arguments
+if len(sys.argv) < 3:
+    raise ValueError('Usage: bench.py curve benchmark')
+curve     = sys.argv[1]
+benchmark = sys.argv[2]
+
+# Import curve module
+if   curve == "curve25519": from curve25519 import *
+elif curve == "curve448"  : from curve448   import *
+else: raise ValueError('Uknnown curve module')
+
+# remaining imports
+from elligator import *
+from random    import randrange
+from random    import seed
+
+
+#############
+# Utilities #
+#############
+def timing(f, inputs):
+    """Average time in seconds of f(*i) for each i in inputs"""
+    start = time.perf_counter()
+    for i in inputs:
+        f(*i)
+    return (time.perf_counter() - start) / len(inputs)
+
+def report(name, seconds, reference=None):
+    line = "{:<24} {:>10.1f} us".format(name, seconds * 1e6)
+    if reference:
+        line += "   (x{:.2f})".format(reference / seconds)
+    print(line)
+
+
+####################
+# Fixed base combs #
+####################
+def comb_benchmark():
+    """Fixed base comb vs generic double and add"""
+    seed(12345)
+    scalars = [(clamp(randrange(2**(GF.nb_bytes * 8))),) for _ in range(32)]
+    Ed.base_scalarmult(1)  # build the table outside of the measure
+    bits    = GF.msb + 1
+    spacing = Ed.comb[1]
+    print("{}: {} bits, {} teeth".format(curve, bits, Ed.comb_teeth))
+    print("doublings: {} (double and add), {} (comb)".format(bits, spacing))
+    ref  = timing(lambda s: Ed.scalarmult(Ed.base, s), scalars)
+    comb = timing(Ed.base_scalarmult                 , scalars)
+    report("Ed.scalarmult(base)", ref)
+    report("Ed.base_scalarmult" , comb, ref)
+
+
+##################
+# Field elements #
+##################
+def field_benchmark():
+    """Direct and inverse maps"""
+    seed(12345)
+    reps  = [(GF(randrange(GF.p)),) for _ in range(256)]
+    us    = [(dir_map_fast(r)[0], False) for r, in reps]
+    print("{}: field element size: {} bytes".format(
+        curve, sys.getsizeof(GF(1))))
+    report("dir_map_fast", timing(dir_map_fast, reps))
+    report("rev_map_fast", timing(rev_map_fast, us  ))
+
+
+###############
+# Self checks #
+###############
+def checks_benchmark():
+    """Checked functions, at each verification level"""
+    seed(12345)
+    reps    = [(GF(randrange(GF.p)),) for _ in range(64)]
+    us      = [(dir_map_fast(r)[0], False) for r, in reps]
+    scalars = [(s, s % Mt.cofactor)
+               for s in [randrange(2**(GF.nb_bytes * 8)) for _ in range(16)]]
+    Ed.base_scalarmult(1)  # build the table outside of the measure
+    for level in ("full", "sampled", "off"):
+        Checks.level = level
+        Checks.reset()
+        report("dir_map ("       + level + ")", timing(dir_map      , reps   ))
+        report("rev_map ("       + level + ")", timing(rev_map      , us     ))
+        report("co_scalarmult (" + level + ")", timing(co_scalarmult, scalars))
+        print("checks: {} runs, {} failures".format(Checks.runs,
+                                                    Checks.failures))
+    Checks.level = "full"
+
+
+####################
+# Legendre symbols #
+####################
+def legendre_benchmark():
+    """Legendre symbol: exponentiation vs Jacobi symbol"""
+    seed(12345)
+    numbers = [(GF(randrange(GF.p)),) for _ in range(256)]
+    us      = [(dir_map_fast(n)[0],) for n, in numbers]
+    for n, in numbers:
+        if legendre_pow(n) != legendre_jacobi(n):
+            raise ValueError('Legendre symbol mismatch')
+    pow_time = timing(legendre_pow, numbers)
+    report("legendre_pow"   , pow_time)
+    report("legendre_jacobi", timing(legendre_jacobi, numbers), pow_time)
+    rev_time = timing(lambda u: rev_map_fast(u, False), us)
+    report("rev_map_fast"   , rev_time)
+    report("is_mappable"    , timing(is_mappable, us), rev_time)
+
+
+#########################
+# Variable base (wNAF) #
+#########################
+def wnaf_benchmark():
+    """Width-w NAF vs double and add, for a variable base"""
+    seed(12345)
+    scalars = [(clamp(randrange(2**(GF.nb_bytes * 8))),) for _ in range(32)]
+    point   = Ed.scalarmult(Ed.base, randrange(Mt.order))
+    add     = Ed.add
+    adds    = [0]
+    def counted_add(p1, p2):
+        adds[0] += 1
+        return add(p1, p2)
+    def additions(f, *args):
+        adds[0] = 0
+        Ed.add  = counted_add
+        try    : f(*args)
+        finally: Ed.add = add
+        return adds[0]
+    scalar = scalars[0][0]
+    ref    = timing(lambda s: Ed.scalarmult_binary(point, s, "off"), scalars)
+    print("{}: {} bit scalars".format(curve, scalar.bit_length()))
+    print("{:<24} {:>6} additions".format(
+        "double and add", additions(Ed.scalarmult_binary, point, scalar)))
+    report("double and add", ref)
+    for width in range(2, 7):
+        name = "wNAF, width {}".format(width)
+        wnaf = timing(lambda s: Ed.scalarmult(point, s, "off", width),
+                      scalars)
+        print("{:<24} {:>6} additions".format(
+            name, additions(Ed.scalarmult, point, scalar, "off", width)))
+        report(name, wnaf, ref)
+
+
+#####################
+# Montgomery ladder #
+#####################
+def ladder_benchmark():
+    """Single ladders vs lockstep ladders with one shared inversion"""
+    seed(12345)
+    size    = 32
+    us      = [GF(randrange(GF.p)) for _ in range(size)]
+    scalars = [clamp(randrange(2**(GF.nb_bytes * 8))) for _ in range(size)]
+    single  = timing(Mt.scalarmult, list(zip(us, scalars)))
+    start   = time.perf_counter()
+    Mt.scalarmult_batch(us, scalars)
+    batch   = (time.perf_counter() - start) / size
+    report("Mt.scalarmult"      , single)
+    report("Mt.scalarmult_batch", batch, single)
+
+
+###############
+# Import time #
+###############
+# Runs in a fresh interpreter, where the curve module has not been
+# imported yet.  core is imported first, so we can count the field
+# operations performed by the import of the curve module itself.
+import_script = """
+import time
+import core
+start          = time.perf_counter()
+module, counts = core.count_ops(__import__, "{curve}")
+seconds        = time.perf_counter() - start
+_, test_counts = core.count_ops(module.self_test)
+print(seconds, counts["pow"], counts["inv"],
+      test_counts["pow"], test_counts["inv"])
+"""
+
+def import_benchmark():
+    """Import time of the curve module, and the work it does"""
+    script = import_script.format(curve=curve)
+    runs   = [subprocess.run([sys.executable, "-c", script],
+                             capture_output=True, text=True, check=True)
+              for _ in range(8)]
+    values = [[float(v) for v in r.stdout.split()] for r in runs]
+    _, pow, inv, test_pow, test_inv = values[0]
+    report("import " + curve, min(v[0] for v in values))
+    print("exponentiations: {:>4} (self_test(): {})".format(int(pow),
+                                                         int(test_pow)))
+    print("inversions     : {:>4} (self_test(): {})".format(int(inv),
+                                                         int(test_inv)))
+
+
+#########################
+# Field operation costs #
+#########################
+def costs_benchmark():
+    """Field operations performed by each function (one call each)"""
+    seed(12345)
+    r       = GF(randrange(GF.p))
+    u       = dir_map_fast(GF(randrange(GF.p)))[0]  # mappable
+    scalar  = randrange(2**(GF.nb_bytes * 8))
+    c       = scalar % Mt.cofactor
+    functions = [
+        ("inv_sqrt"        , inv_sqrt        , (r,)),
+        ("sqrt"            , sqrt            , (r**2,)),
+        ("legendre"        , legendre        , (r,)),
+        ("dir_map_ref"     , dir_map_ref     , (r,)),
+        ("dir_map_fast"    , dir_map_fast    , (r,)),
+        ("rev_map_ref"     , rev_map_ref     , (u, False)),
+        ("rev_map_fast"    , rev_map_fast    , (u, False)),
+        ("Mt.scalarmult"   , Mt.scalarmult   , (u, clamp(scalar))),
+        ("Ed.scalarmult"   , Ed.scalarmult   , (Ed.base, clamp(scalar), "off")),
+        ("Ed.base_scalarmult", Ed.base_scalarmult, (clamp(scalar), "off")),
+        ("Ed.co_scalarmult", Ed.co_scalarmult, (scalar, c, "off")),
+        ("Mt.co_scalarmult", Mt.co_scalarmult, (scalar, c)),
+    ]
+    if curve == "curve25519":
+        import hash_to_curve25519
+        Checks.level = "off"
+        functions.append(("map_to_curve", hash_to_curve25519.map_to_curve,
+                          (randrange(2**256),)))
+    Ed.base_scalarmult(1)  # build the table outside of the measure
+    columns = ["mul", "sqr", "add", "neg", "inv", "pow",
+               "jacobi", "cmove", "cswap"]
+    print("{:<20}".format(curve) + "".join("{:>8}".format(c)
+                                           for c in columns))
+    for name, function, args in functions:
+        _, counts = core.count_ops(function, *args)
+        print("{:<20}".format(name) + "".join("{:>8}".format(counts[c])
+                                              for c in columns))
+    Checks.level = "full"
+
+
+####################
+# Integer backends #
+####################
+def backends_benchmark():
+    """Square roots, inversions and scalar multiplication, per backend"""
+    import context
+    seed(12345)
+    numbers   = [randrange(1, GF.p)              for _ in range(64)]
+    scalars   = [randrange(2**(GF.nb_bytes * 8)) for _ in range(16)]
+    reference = {}  # timings of the first backend
+    for name in core.backend_names:
+        ctx = context.load(curve, name)
+        if ctx.backend != name:
+            print("{}: not available, skipped".format(name))
+            continue
+        ctx.Checks.level = "off"
+        ctx.Ed.base_scalarmult(1)  # build the table outside of the measure
+        elements = [(ctx.GF(n),)    for n in numbers]
+        squares  = [(ctx.GF(n)**2,) for n in numbers]
+        cofactor = [(s, s % ctx.Mt.cofactor) for s in scalars]
+        print("{} ({})".format(curve, name))
+        for function, inputs in (("inv_sqrt"     , elements),
+                                 ("sqrt"         , squares ),
+                                 ("invert"       , elements),
+                                 ("co_scalarmult", cofactor)):
+            f = (ctx.GF.invert if function == "invert"
+                 else getattr(ctx, function))
+            seconds = timing(f, inputs)
+            report(function, seconds, reference.get(function))
+            reference.setdefault(function, seconds)
+
+
+################
+# Main program #
+################
+benchmarks = {"comb"    : comb_benchmark,
+              "field"   : field_benchmark,
+              "checks"  : checks_benchmark,
+              "legendre": legendre_benchmark,
+              "costs"   : costs_benchmark,
+              "ladder"  : ladder_benchmark,
+              "wnaf"    : wnaf_benchmark,
+              "import"  : import_benchmark,
+              "backends": backends_benchmark,
+              }
+benchmarks[benchmark]()
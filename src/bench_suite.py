@@ -0,0 +1,241 @@
+#! /usr/bin/env python3
+
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import sys
+
+# remaining imports
+from random import Random
+import argparse
+import context
+import json
+import math
+import os
+import time
+
+# Regression gate for the hot primitives, on both curves.
+#
+# Each primitive is called many times on random (but deterministic)
+# inputs, and each call is timed separately.  We report operations per
+# second, latency percentiles and standard deviation, in JSON.  To
+# filter out noise from the rest of the machine, we measure several
+# rounds and keep the fastest (by median latency).  The
+# results are then compared against a baseline (bench_baseline.json by
+# default): when the median latency of a primitive is more than
+# `threshold` slower than the baseline, the gate fails.
+#
+# Self checks are turned off: we measure what production code runs.
+#
+# A stale baseline hides regressions: after a speed up, a primitive can
+# slow down again by that much before the gate notices.  Changes that
+# make a measured primitive faster must refresh the baseline (--update)
+# in the same commit.
+#
+# Usage:
+#     ./bench_suite.py                   # compare with the baseline
+#     ./bench_suite.py --output new.json # also save the results
+#     ./bench_suite.py --update          # overwrite the baseline
+
+directory = os.path.dirname(os.path.abspath(__file__))
+baseline  = os.path.join(directory, "bench_baseline.json")
+
+
+##############
+# Primitives #
+##############
+def primitives(ctx, rng):
+    """Primitives to measure: name -> (function, list of arguments)"""
+    GF      = ctx.GF
+    Ed      = ctx.Ed
+    Mt      = ctx.Mt
+    size    = 2**(GF.nb_bytes * 8)
+    numbers = [GF(rng.randrange(GF.p)) for _ in range(16)]
+    points  = [ctx.dir_map_fast(n) for n in numbers]
+    scalars = [rng.randrange(size) for _ in range(16)]
+    prims   = {
+        "inv_sqrt"     : (ctx.inv_sqrt    , [(n,) for n in numbers]),
+        "sqrt"         : (ctx.sqrt        , [(n**2,) for n in numbers]),
+        "dir_map_ref"  : (ctx.dir_map_ref , [(n,) for n in numbers]),
+        "dir_map_fast" : (ctx.dir_map_fast, [(n,) for n in numbers]),
+        "rev_map_ref"  : (ctx.rev_map_ref ,
+                          [(u, v.is_negative()) for u, v in points]),
+        "rev_map_fast" : (ctx.rev_map_fast,
+                          [(u, v.is_negative()) for u, v in points]),
+        "Mt.scalarmult": (Mt.scalarmult   ,
+                          [(u, ctx.clamp(s)) for (u, _), s
+                           in zip(points, scalars)]),
+        "Ed.scalarmult": (Ed.scalarmult   ,
+                          [(Ed.base, ctx.clamp(s), "off") for s in scalars]),
+        "co_scalarmult": (ctx.co_scalarmult,
+                          [(s, s % Mt.cofactor, "off") for s in scalars]),
+    }
+    if ctx.name == "curve25519":
+        import hash_to_curve25519
+        prims["map_to_curve"] = (hash_to_curve25519.map_to_curve,
+                                 [(rng.randrange(2**256),) for _ in range(16)])
+    return prims
+
+
+###############
+# Measurement #
+###############
+def percentile(sorted_samples, p):
+    """Nearest rank percentile"""
+    rank = math.ceil(p / 100 * len(sorted_samples)) - 1
+    return sorted_samples[max(rank, 0)]
+
+def measure_round(function, inputs, iterations):
+    """Latency statistics in microseconds, one sample per call"""
+    samples = []
+    for i in range(iterations):
+        args  = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        function(*args)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    mean     = sum(samples) / len(samples)
+    variance = sum((s - mean)**2 for s in samples) / len(samples)
+    return {"ops_per_sec": 1e6 / mean,
+            "mean_us"    : mean,
+            "p50_us"     : percentile(samples, 50),
+            "p90_us"     : percentile(samples, 90),
+            "p99_us"     : percentile(samples, 99),
+            "stdev_us"   : math.sqrt(variance),
+            "iterations" : iterations,
+            }
+
+def measure(function, inputs, iterations, rounds):
+    """Statistics of the fastest round"""
+    for args in inputs[:2]:  # warm up
+        function(*args)
+    stats = [measure_round(function, inputs, iterations)
+             for _ in range(rounds)]
+    return min(stats, key=lambda s: s["p50_us"])
+
+def run_suite(iterations, rounds, only=None):
+    """Measures every primitive of every curve"""
+    # map_to_curve() uses the global modules, not a context
+    import core
+    import hash_to_curve25519
+    core.Checks.level = "off"
+    results = {}
+    for curve in context.curves:
+        ctx = context.load(curve)
+        ctx.Checks.level = "off"
+        rng = Random(curve)  # deterministic inputs
+        results[curve] = {}
+        for name, (function, inputs) in primitives(ctx, rng).items():
+            if only and name not in only:
+                continue
+            stats = measure(function, inputs, iterations, rounds)
+            results[curve][name] = stats
+            print("{:<10} {:<14} {:>10.1f} ops/s  p50 {:>9.1f} us"
+                  "  p99 {:>9.1f} us  stdev {:>8.1f} us".format(
+                      curve, name, stats["ops_per_sec"], stats["p50_us"],
+                      stats["p99_us"], stats["stdev_us"]))
+    return results
+
+
+##############
+# Comparison #
+##############
+def regressions(results, reference, threshold):
+    """Primitives whose median latency regressed beyond the threshold"""
+    slow = []
+    for curve, prims in results.items():
+        for name, stats in prims.items():
+            old = reference.get(curve, {}).get(name)
+            if old is None:
+                continue
+            ratio = stats["p50_us"] / old["p50_us"]
+            if ratio > 1 + threshold:
+                slow.append((curve, name, ratio))
+    return slow
+
+
+################
+# Main program #
+################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark regression gate')
+    parser.add_argument('--iterations', type=int, default=32)
+    parser.add_argument('--rounds'    , type=int, default=3)
+    parser.add_argument('--output'    , help='where to save the results')
+    parser.add_argument('--baseline'  , default=baseline)
+    parser.add_argument('--threshold' , type=float, default=0.5,
+                        help='tolerated slow down (0.5 means 50%%)')
+    parser.add_argument('--update'    , action='store_true',
+                        help='overwrite the baseline with the results')
+    parser.add_argument('--only'      , nargs='*',
+                        help='only measure these primitives')
+    args    = parser.parse_args()
+    results = run_suite(args.iterations, args.rounds, args.only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        reference = json.load(f)
+    slow = regressions(results, reference, args.threshold)
+    for curve, name, ratio in slow:
+        print("REGRESSION: {} {} is {:.0f}% slower than the baseline".format(
+            curve, name, (ratio - 1) * 100))
+    if slow:
+        sys.exit(1)
+    print("OK: no regression beyond {:.0f}%".format(args.threshold * 100))
@@ -0,0 +1,233 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from collections        import deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import context
+import sys
+
+# Bulk map/unmap over binary records, for shell pipelines
+#
+# Reads fixed width binary records from a file or the standard input,
+# applies one operation to each record, and writes the results to the
+# standard output, in the same order (binary records, or one hex line
+# per record).  The input is read in chunks of records, and at most
+# 2 * jobs chunks are in flight at any time, so memory use does not
+# depend on the size of the input.
+#
+# Operations (n is the size of a field element: 32 or 56 bytes):
+#
+#     map        in : representative (n)
+#                out: u (n)
+#     unmap      in : u (n), then one byte whose bit 0 is the sign of v
+#                out: one byte (1 if the map succeeded, 0 otherwise),
+#                     then the representative (n, zero on failure)
+#     hash       in : message (--size bytes, 32 by default)
+#                out: Edwards point, RFC 9380 hash_to_curve() with the
+#                     domain separation tag --dst (required, it must
+#                     not be empty), serialised as in
+#                     RFC 8032 (32 bytes for Edwards25519, 57 for
+#                     Edwards448)
+#     scalarmult in : scalar (n), then u (n)
+#                out: X25519 / X448 of the scalar and u (n)
+#
+# Usage:
+#     ./bulk.py curve25519 map < representatives > public_keys
+#     ./bulk.py curve448 unmap keys.bin --hex --jobs 4
+#     ./bulk.py curve25519 hash messages --dst "MyApp-V01-CS01"
+
+chunk_records = 1024  # records per chunk (default)
+
+
+##############
+# Operations #
+##############
+# Run in the worker processes.  They take and return whole chunks, so
+# processes only exchange a few big byte strings.
+def hash_module(curve):
+    if curve == "curve25519":
+        import hash_to_curve25519
+        return hash_to_curve25519, 32
+    import hash_to_curve448
+    return hash_to_curve448, 57
+
+def record_sizes(curve, operation, size):
+    """(input size, output size) of the records of an operation"""
+    n = context.load(curve).GF.nb_bytes
+    if operation == "map"       : return n        , n
+    if operation == "unmap"     : return n + 1    , n + 1
+    if operation == "scalarmult": return n * 2    , n
+    if operation == "hash"      : return size     , hash_module(curve)[1]
+    raise ValueError('Unknown operation: ' + operation)
+
+def process(curve, operation, dst, size, chunk):
+    """Applies the operation to every record of a chunk"""
+    ctx              = context.load(curve)
+    ctx.Checks.level = "off"
+    n                = ctx.GF.nb_bytes
+    width, _         = record_sizes(curve, operation, size)
+    records          = [chunk[i:i + width] for i in range(0, len(chunk), width)]
+    out              = []
+    if operation == "map":
+        for record in records:
+            u, _ = ctx.dir_map_fast(ctx.decode(record))
+            out.append(ctx.encode(u))
+    elif operation == "unmap":
+        for record in records:
+            r = ctx.rev_map_fast(ctx.decode(record[:n]), record[n] & 1 == 1)
+            if r is None: out.append(bytes(n + 1))
+            else        : out.append(b"\x01" + ctx.encode(r))
+    elif operation == "scalarmult":
+        for record in records:
+            scalar = ctx.clamp(int.from_bytes(record[:n], 'little'))
+            u      = ctx.decode(record[n:])
+            out.append(ctx.encode(ctx.Mt.scalarmult(u, scalar)))
+    elif operation == "hash":
+        module, out_size = hash_module(curve)
+        module.Checks.level = "off"
+        for record in records:
+            x, y = module.hash_to_edwards(record, dst)
+            out.append(module.serialise(x, y).to_bytes(out_size, 'little'))
+    return b"".join(out)
+
+
+##################
+# Input / output #
+##################
+def read_chunks(stream, chunk_size):
+    """Chunks of exactly chunk_size bytes (the last one may be shorter)
+
+    Pipes may return less than requested, so we keep reading until the
+    chunk is full or the input ends.
+    """
+    while True:
+        chunk = bytearray()
+        while len(chunk) < chunk_size:
+            data = stream.read(chunk_size - len(chunk))
+            if not data:
+                break
+            chunk += data
+        if chunk:
+            yield bytes(chunk)
+        if len(chunk) < chunk_size:
+            return
+
+def write_records(stream, data, width, hex_output):
+    if not hex_output:
+        stream.write(data)
+        return
+    lines = [data[i:i + width].hex() for i in range(0, len(data), width)]
+    stream.write(("\n".join(lines) + "\n").encode())
+
+def run(curve, operation, input, output, jobs=1, hex_output=False,
+        dst=b"", size=32, records=chunk_records):
+    """Streams the operation over input, to output"""
+    width, out_width = record_sizes(curve, operation, size)
+    if width < 1:
+        raise ValueError('Records must be at least 1 byte long')
+    def check(chunk):
+        if len(chunk) % width != 0:
+            raise ValueError('Input is not a whole number of records')
+        return chunk
+    chunks = read_chunks(input, width * records)
+    if jobs == 1:
+        for chunk in chunks:
+            write_records(output, process(curve, operation, dst, size,
+                                          check(chunk)),
+                          out_width, hex_output)
+        return
+    with ProcessPoolExecutor(jobs) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(process, curve, operation,
+                                             dst, size, check(chunk)))
+            if len(in_flight) >= 2 * jobs:
+                write_records(output, in_flight.popleft().result(),
+                              out_width, hex_output)
+        while in_flight:
+            write_records(output, in_flight.popleft().result(),
+                          out_width, hex_output)
+
+
+################
+# Main program #
+################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bulk map/unmap')
+    parser.add_argument('curve'    , choices=context.curves)
+    parser.add_argument('operation',
+                        choices=["map", "unmap", "hash", "scalarmult"])
+    parser.add_argument('input'    , nargs='?',
+                        help='input file (default: standard input)')
+    parser.add_argument('--hex'    , action='store_true',
+                        help='write one hex record per line')
+    parser.add_argument('--jobs'   , type=int, default=1)
+    parser.add_argument('--records', type=int, default=chunk_records,
+                        help='records per chunk')
+    parser.add_argument('--dst'    ,
+                        help='domain separation tag (required for hash)')
+    parser.add_argument('--size'   , type=int, default=32,
+                        help='message size in bytes (hash only)')
+    args   = parser.parse_args()
+    if args.operation == "hash" and not args.dst:
+        parser.error('hash needs a non empty --dst (RFC 9380, section 3.1)')
+    output = sys.stdout.buffer
+    input  = open(args.input, 'rb') if args.input else sys.stdin.buffer
+    try:
+        run(args.curve, args.operation, input, output, args.jobs,
+            args.hex, (args.dst or "").encode(), args.size, args.records)
+    finally:
+        if args.input:
+            input.close()
+    output.flush()
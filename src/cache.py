@@ -0,0 +1,164 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from collections import OrderedDict
+from threading   import Lock
+import context
+
+# Peers that reconnect present the same representatives over and over.
+# Decoding them again costs an inverse square root every time.  The
+# caches below remember the results of the direct and inverse maps, so
+# long lived keys only pay once:
+#
+#     cache = Cache("curve25519", capacity=4096)
+#     u, v  = cache.dir_map(representative_bytes)  # hidden public key
+#     r     = cache.rev_map(u, v_is_negative)      # our own public key
+#
+# Representatives are keyed on their canonical bytes: padding bits are
+# ignored, and non canonical encodings (above p) are reduced first.
+# Caching is opt-in: nothing else in the code base uses it.
+
+
+#############
+# LRU cache #
+#############
+class LRU():
+    """Bounded mapping that evicts the least recently used entries
+
+    Safe to share between threads.  Values are computed outside of the
+    lock, so two threads missing the same key at the same time may both
+    compute it.  The result is the same either way.
+    """
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1')
+        self.capacity  = capacity
+        self.entries   = OrderedDict()
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self.lock      = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, compute):
+        """Value associated with key, compute() if it is absent"""
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Removes all entries (the counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit, miss, and eviction statistics"""
+        with self.lock:
+            return {"size"     : len(self.entries),
+                    "capacity" : self.capacity,
+                    "hits"     : self.hits,
+                    "misses"   : self.misses,
+                    "evictions": self.evictions,
+                    }
+
+
+#########################
+# Elligator map caching #
+#########################
+class Cache():
+    """Memoised direct and inverse maps, for one curve
+
+    The direct and inverse maps have separate caches, with the same
+    capacity.
+    """
+    def __init__(self, curve, capacity=1024):
+        self.ctx     = context.load(curve)
+        self.direct  = LRU(capacity)
+        self.inverse = LRU(capacity)
+
+    def dir_map(self, data):
+        """Point (u, v) of a serialised representative"""
+        ctx = self.ctx
+        r   = ctx.decode(data)
+        return self.direct.get(ctx.encode(r), lambda: ctx.dir_map_fast(r))
+
+    def rev_map(self, u, v_is_negative):
+        """Representative of (u, v), or None if it cannot be mapped"""
+        ctx = self.ctx
+        key = (ctx.encode(u), v_is_negative)
+        return self.inverse.get(key, lambda: ctx.rev_map_fast(u,
+                                                              v_is_negative))
+
+    def clear(self):
+        """Empties both caches"""
+        self.direct .clear()
+        self.inverse.clear()
+
+    def stats(self):
+        """Statistics of both caches"""
+        return {"dir_map": self.direct .stats(),
+                "rev_map": self.inverse.stats(),
+                }
@@ -0,0 +1,204 @@
+#! /usr/bin/env python3
+
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import sys
+
+# collect arguments
+if __name__ == "__main__" and len(sys.argv) < 4:
+    raise ValueError('Usage: check_vectors.py curve vectors file [jobs]')
+
+# remaining imports
+from collections        import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import context
+import mmap
+import re
+import time
+
+
+##########
+# Reader #
+##########
+
+# Test vector files are described in vectors/index.txt: each test case
+# is a fixed number of hexadecimal numbers (little endian), followed by
+# a colon.  Test cases are separated by empty lines, but like the C
+# tests we only rely on the number of vectors per test case.
+Direct     = namedtuple('Direct'    , 'offset r u v'                )
+Inverse    = namedtuple('Inverse'   , 'offset u v_is_negative fails r')
+Scalarmult = namedtuple('Scalarmult', 'offset scalar public'        )
+test_types = {"direct"    : Direct,
+              "inverse"   : Inverse,
+              "scalarmult": Scalarmult,
+              }
+hex_vector = re.compile(rb'([0-9a-fA-F]*):')
+
+def to_num(hex_string):
+    """Little endian hexadecimal number, None if empty"""
+    if hex_string == b"":
+        return None
+    return int.from_bytes(bytes.fromhex(hex_string.decode()), 'little')
+
+def read_vectors(path, vectors):
+    """Lazily reads the test cases of a vector file
+
+    The file is memory mapped, so it can be much bigger than memory.
+    Yields named tuples (Direct, Inverse, or Scalarmult) of integers,
+    starting with the offset of the test case in the file.
+    Booleans are converted: v_is_negative ("01:") and fails ("ff:").
+    """
+    test_type = test_types[vectors]
+    size      = len(test_type._fields) - 1
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return  # empty file (mmap doesn't like those)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            numbers = []
+            offset  = 0
+            for match in hex_vector.finditer(m):
+                if numbers == []:
+                    offset = match.start()
+                numbers.append(to_num(match.group(1)))
+                if len(numbers) == size:
+                    if test_type is Inverse:
+                        numbers[1] = numbers[1] == 1
+                        numbers[2] = numbers[2] == 255
+                    yield test_type(offset, *numbers)
+                    numbers = []
+            if numbers != []:
+                raise ValueError('Truncated test case at offset '
+                                 + str(offset))
+
+
+############
+# Verifier #
+############
+def check_case(ctx, case):
+    """Does our implementation agree with the test case?"""
+    GF = ctx.GF
+    if type(case) is Direct:
+        return ctx.dir_map_fast(GF(case.r)) == (GF(case.u), GF(case.v))
+    if type(case) is Inverse:
+        r = ctx.rev_map_fast(GF(case.u), case.v_is_negative)
+        if case.fails: return r is None
+        else         : return r is not None and r == GF(case.r)
+    if type(case) is Scalarmult:
+        c      = case.scalar % ctx.Mt.cofactor
+        public = ctx.co_scalarmult(case.scalar, c, "off")
+        return public == GF(case.public)
+    raise ValueError('Unknown test case')
+
+def check_cases(curve, cases):
+    """Offset of the first failing test case, or None
+
+    Runs in worker processes (hence the curve name instead of the
+    context).
+    """
+    ctx = context.load(curve)
+    for case in cases:
+        if not check_case(ctx, case):
+            return case.offset
+    return None
+
+def chunks(iterable, size):
+    """Splits the iterable in lists of size elements (or fewer)"""
+    chunk = []
+    for element in iterable:
+        chunk.append(element)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk != []:
+        yield chunk
+
+def check_vectors(curve, vectors, path, jobs=1, chunk_size=64):
+    """Checks a whole vector file, stops at the first mismatch
+
+    Chunks of test cases are checked in parallel, one window of chunks
+    at a time, so memory use stays bounded.
+    Returns (number of test cases, seconds, first mismatch offset).
+    """
+    start   = time.perf_counter()
+    nb_case = 0
+    cases   = read_vectors(path, vectors)
+    with ProcessPoolExecutor(jobs) as executor:
+        for window in chunks(chunks(cases, chunk_size), 4 * jobs):
+            curves = [curve] * len(window)
+            for chunk, mismatch in zip(window, executor.map(check_cases,
+                                                            curves,
+                                                            window)):
+                if mismatch is not None:
+                    nb_case += sum(1 for c in chunk if c.offset <= mismatch)
+                    return nb_case, time.perf_counter() - start, mismatch
+                nb_case += len(chunk)
+    return nb_case, time.perf_counter() - start, None
+
+
+################
+# Main program #
+################
+if __name__ == "__main__":
+    curve   = sys.argv[1]
+    vectors = sys.argv[2]
+    path    = sys.argv[3]
+    jobs    = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    nb_case, seconds, mismatch = check_vectors(curve, vectors, path, jobs)
+    speed = nb_case / seconds if seconds > 0 else 0
+    print("{} {}: {} test cases, {:.1f} cases/s".format(
+        curve, vectors, nb_case, speed))
+    if mismatch is not None:
+        print("FAILED: mismatch at offset {}".format(mismatch))
+        sys.exit(1)
+    print("OK")
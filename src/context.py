@@ -0,0 +1,162 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from threading import Lock
+import importlib.util
+import os
+import sys
+
+# The curve modules configure core.py by monkey patching it: GF.p, the
+# square root functions, the curve constants, the Elligator constants...
+# That's fine for a reference implementation, but it means that
+# importing both curve modules in the same process doesn't work: the
+# last import wins.
+#
+# A context gathers everything a curve needs in a single immutable
+# object.  Each context gets its own private copy of core.py, the curve
+# module and elligator.py, so several curves can run side by side, in
+# the same process, even in the same thread pool:
+#
+#     c25519 = context.load("curve25519")
+#     c448   = context.load("curve448")
+#     u, v   = c25519.dir_map_fast(c25519.GF(42))
+#     r      = c448.rev_map_fast(c448.GF(5), False)
+#
+# Field elements from different contexts have different types, and must
+# not be mixed.  To pass them between processes, use integers
+# (to_num() one way, ctx.GF() the other).
+
+directory = os.path.dirname(os.path.abspath(__file__))
+curves    = ("curve25519", "curve448")
+contexts  = {}     # one context per curve (and backend), loaded on first use
+lock      = Lock()
+
+class Context():
+    """Everything specific to a curve
+
+    Attributes are the public names of core.py, the curve module and
+    elligator.py (GF, Ed, Mt, sqrt, inv_sqrt, dir_map_fast...), plus:
+    - name     : name of the curve module
+    - core     : private copy of core.py
+    - curve    : private copy of the curve module
+    - elligator: private copy of elligator.py
+
+    Contexts are immutable: their attributes cannot be reassigned.
+    """
+    def __init__(self, name, core, curve, elligator):
+        for module in (core, curve, elligator):  # last one wins
+            for key, value in vars(module).items():
+                if not key.startswith('__'):
+                    object.__setattr__(self, key, value)
+        object.__setattr__(self, 'name'     , name     )
+        object.__setattr__(self, 'core'     , core     )
+        object.__setattr__(self, 'curve'    , curve    )
+        object.__setattr__(self, 'elligator', elligator)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Curve contexts are immutable')
+
+    def __delattr__(self, key):
+        raise AttributeError('Curve contexts are immutable')
+
+    def __repr__(self):
+        return "Context(" + self.name + ")"
+
+def fresh_modules(names, configure=None):
+    """Executes private copies of the modules, in order
+
+    Later modules import the earlier ones ("import core"), so we put
+    the copies in sys.modules while loading them.  The previous modules
+    (if any) are restored afterwards.  configure(module), if given, runs
+    right after each module is executed, before the next one.
+    """
+    saved   = {name: sys.modules.get(name) for name in names}
+    modules = []
+    try:
+        for name in names:
+            path   = os.path.join(directory, name + ".py")
+            spec   = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            if configure is not None:
+                configure(module)
+            modules.append(module)
+    finally:
+        for name, module in saved.items():
+            if module is None: sys.modules.pop(name, None)
+            else             : sys.modules[name] = module
+    return modules
+
+def load(curve, backend=None):
+    """Context of the curve ("curve25519" or "curve448")
+
+    backend selects the integer backend of the context ("int" or
+    "gmpy2", see core.set_backend()).  By default, contexts use the
+    backend selected at import time.  Contexts with different backends
+    are distinct, and can be used side by side.
+    """
+    if curve not in curves:
+        raise ValueError('Uknnown curve module')
+    def use_backend(module):
+        # before the curve module computes its constants
+        if module.__name__ == "core" and backend is not None:
+            module.set_backend(backend)
+    with lock:
+        key = curve if backend is None else (curve, backend)
+        if key not in contexts:
+            core, module, elligator = fresh_modules(("core", curve,
+                                                     "elligator"),
+                                                    use_backend)
+            contexts[key] = Context(curve, core, module, elligator)
+        return contexts[key]
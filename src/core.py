@@ -51,7 +51,15 @@
 # with this software.  If not, see
 # <https://creativecommons.org/publicdomain/zero/1.0/>
 
-import math # log
+from collections import Counter
+from random      import Random
+from threading   import Lock
+import os
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None  # optional, see set_backend()
 
 ####################
 # Field arithmetic #
@@ -66,29 +74,51 @@ class GF():
 
     the fowlowing is not implemented, and must be defined
     with inheritance or monkey patching:
-    - p                 : characteristic of the field
+    - p                 : characteristic of the field (use set_p())
     - is_negative(self) : set of negative field elements
+
+    Values are Python ints by default, see set_backend() for others.
     """
+    __slots__ = ('val',)  # no __dict__, cheaper allocations
 
-    def __init__(self, x):
-        GF.msb         = round(math.log(GF.p, 2)) - 1
-        GF.nb_bytes    = math.ceil((GF.msb + 1) / 8)
+    def set_p(p):
+        """Sets the characteristic of the field, and derived constants"""
+        GF.p           = p
+        GF.msb         = p.bit_length() - 1
+        GF.nb_bytes    = (GF.msb + 8) // 8  # ceil((msb + 1) / 8)
         GF.nb_pad_bits = GF.nb_bytes * 8 - GF.msb - 1
         GF.max_pad     = 2**GF.nb_pad_bits
-        self.val       = x % self.p
+        GF.modulus     = GF.integer(p)  # p, in the integer backend
+
+    def __init__(self, x):
+        self.val = x % self.modulus
+
+    def raw(x):
+        """Field element from x, without reducing it modulo p"""
+        e     = object.__new__(GF)
+        e.val = x
+        return e
 
     # Basic arithmetic operations
-    def __neg__     (self   ): return GF(-self.val                            )
-    def __add__     (self, o): return GF( self.val +  o.val                   )
-    def __sub__     (self, o): return GF( self.val -  o.val                   )
-    def __mul__     (self, o): return GF((self.val *  o.val         ) % self.p)
-    def __truediv__ (self, o): return GF((self.val *  o.invert().val) % self.p)
-    def __floordiv__(self, o): return GF( self.val // o) # same as __truediv__
-    def __pow__     (self, s): return GF(pow(self.val, s       , self.p))
-    def invert      (self   ): return GF(pow(self.val, self.p-2, self.p))
-
-    def __eq__(self, other): return self.val % self.p == other.val % self.p
-    def __ne__(self, other): return self.val % self.p != other.val % self.p
+    def __neg__     (self   ): return GF    (-self.val                        )
+    def __add__     (self, o): return GF    ( self.val +  o.val               )
+    def __sub__     (self, o): return GF    ( self.val -  o.val               )
+    def __mul__     (self, o): return GF.raw((self.val *  o.val) % self.modulus)
+    def __truediv__ (self, o): return self * o.invert()
+    def __floordiv__(self, o): return GF    ( self.val // o) # same as __truediv__
+    def __pow__     (self, s): return GF.raw(pow(self.val, s       , self.p))
+    def invert      (self   ): return GF.raw(pow(self.val, self.p-2, self.p))
+
+    # Elements are always reduced.
+    #
+    # Skipping the reduction of negations, additions and subtractions
+    # (lazy reduction, reducing at the next multiplication or
+    # comparison) was tried and removed: it made the maps slower.  On
+    # Curve25519, dir_map_fast went from 255us to 261us and rev_map_fast
+    # from 231us to 236us.  Exponentiations dominate, and the bigger
+    # operands cost more than the reductions saved.
+    def __eq__(self, other): return self.val == other.val
+    def __ne__(self, other): return self.val != other.val
 
     def is_positive(self)  : return not self.is_negative()
     def abs(self):
@@ -96,20 +126,61 @@ class GF():
         else                 : return -self
 
     def to_num(self):
-        return self.val % self.p
+        return int(self.val)  # always a Python int, whatever the backend
 
     def __str__ (self): return str(self.to_num())
     def __repr__(self): return str(self.to_num())
 
+# Operation counts
+#
+# count_ops() runs a function and counts the field operations it
+# performs: multiplications (mul), squarings (sqr), additions and
+# subtractions (add), negations (neg), inversions (inv), and other
+# exponentiations (pow) such as square roots and Legendre symbols.
+# cmove(), cswap() and jacobi() count their calls as well.
+#
+# Divisions count as one inversion and one multiplication.
+# Multiplications by small constants count as regular multiplications.
+op_counts   = None  # Counter while counting, None otherwise
+counted_ops = {
+    '__mul__': lambda a, b: "sqr" if a is b else "mul",
+    '__pow__': lambda a, s: "sqr" if s == 2 else "pow",
+    '__add__': lambda a, b: "add",
+    '__sub__': lambda a, b: "add",
+    '__neg__': lambda a   : "neg",
+    'invert' : lambda a   : "inv",
+}
+
+def count(op):
+    """Counts an operation (only while counting)"""
+    if op_counts is not None:
+        op_counts[op] += 1
+
+def counting(method, kind):
+    def counted(*args):
+        op_counts[kind(*args)] += 1
+        return method(*args)
+    return counted
+
+def count_ops(function, *args):
+    """Runs function(*args), returns (result, Counter of operations)"""
+    global op_counts
+    saved     = {name: GF.__dict__[name] for name in counted_ops}
+    op_counts = Counter()
+    for name, kind in counted_ops.items():
+        setattr(GF, name, counting(saved[name], kind))
+    try:
+        result = function(*args)
+    finally:
+        for name, method in saved.items():
+            setattr(GF, name, method)
+        counts, op_counts = op_counts, None
+    return result, counts
+
 def to_hex(n):
     """Converts a number in hexadecimal (little endian)"""
-    p = GF.p
-    s = ""
-    while p != 0:
-        s += format(n % 256, '02x')
-        n //= 256
-        p //= 256
-    return s + ':'
+    n = n % 2**(GF.nb_bytes * 8)
+    return n.to_bytes(GF.nb_bytes, 'little').hex() + ':'
 
 def vectors_to_string(values):
     strings = []
@@ -121,6 +192,74 @@ def vectors_to_string(values):
     return "\n".join(strings)
 
 
+#################
+# Serialisation #
+#################
+
+# Field elements are serialised in GF.nb_bytes bytes (little endian).
+# When the size of p is not a multiple of 8 bits, the GF.nb_pad_bits
+# most significant bits are unused.  Representatives must look random,
+# so those bits must be filled with random padding (see key exchange).
+def encode(element, pad=0):
+    """Serialises a field element, pad fills the padding bits
+
+    Only the GF.nb_pad_bits least significant bits of pad are used
+    (pad is reduced modulo GF.max_pad), so random bits will do.
+    """
+    n = element.to_num() + (pad % GF.max_pad) * 2**(GF.msb + 1)
+    return n.to_bytes(GF.nb_bytes, 'little')
+
+def decode(data):
+    """Parses a field element, ignores the padding bits
+
+    data must be exactly GF.nb_bytes long.
+    Non canonical inputs (above p) are reduced modulo p.
+    """
+    if len(data) != GF.nb_bytes:
+        raise ValueError('Field elements are ' + str(GF.nb_bytes) +
+                         ' bytes long, got ' + str(len(data)))
+    n = int.from_bytes(data, 'little') % 2**(GF.msb + 1)
+    return GF(n)
+
+def encode_batch(elements, buffer, pads=None, offset=0):
+    """Serialises many field elements, writes them in buffer
+
+    buffer must be writeable (bytearray, memoryview...).
+    The elements are written contiguously, starting at offset.
+    pads (optional) gives the padding of each element (see encode()).
+    """
+    view = memoryview(buffer)
+    size = GF.nb_bytes
+    if offset + len(elements) * size > len(view):
+        raise ValueError('Buffer too small')
+    if pads is None:
+        for element in elements:
+            view[offset:offset + size] = element.to_num().to_bytes(size,
+                                                                   'little')
+            offset += size
+        return
+    shift = GF.msb + 1
+    for element, pad in zip(elements, pads):
+        n = element.to_num() + (pad % GF.max_pad << shift)
+        view[offset:offset + size] = n.to_bytes(size, 'little')
+        offset += size
+
+def decode_batch(buffer, offset=0, count=None):
+    """Parses contiguous field elements from buffer
+
+    Reads count elements starting at offset (by default, all of them).
+    The buffer is read in place, without copying it.
+    """
+    view = memoryview(buffer)
+    size = GF.nb_bytes
+    if count is None:
+        count = (len(view) - offset) // size
+    if offset < 0 or count < 0 or offset + count * size > len(view):
+        raise ValueError('Buffer too small')
+    return [decode(view[i:i + size])
+            for i in range(offset, offset + count * size, size)]
+
+
 ##################################
 # Scalar clamping (X25519, X448) #
 ##################################
@@ -134,7 +273,7 @@ def clamp(scalar):
 ################################
 # Basic square root operations #
 ################################
-def legendre(n):
+def legendre_pow(n):
     """Legendre symbol:
 
     returns  0 if n is zero
@@ -143,11 +282,112 @@ def legendre(n):
     """
     return n**((GF.p-1)//2)
 
+def jacobi(a, n):
+    """Jacobi symbol (a/n), n must be odd and positive
+
+    Binary GCD like algorithm: remove the factors of 2 from a, then
+    swap a and n (quadratic reciprocity), and reduce a modulo n.
+    Each step flips the sign of the result according to the residues
+    of a and n modulo 8.
+
+    Not constant time.  Only use it on public data, or on blinded data
+    (multiplied by a random non-zero square).
+    """
+    count("jacobi")
+    a      = a % n
+    result = 1
+    while a != 0:
+        zeroes = (a & -a).bit_length() - 1  # trailing zeroes of a
+        a      = a >> zeroes
+        if zeroes % 2 == 1 and n % 8 in (3, 5):
+            result = -result  # (2/n) == -1
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result  # reciprocity
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+def legendre_jacobi(n):
+    """Legendre symbol, computed as a Jacobi symbol
+
+    Same results as legendre_pow(), several times faster than the
+    exponentiation (GF.p is prime, so both symbols are equal).
+    """
+    return GF(jacobi_symbol(n.val, GF.modulus))
+
+# Default Legendre symbol, curves may select the fastest one.
+legendre = legendre_pow
+
 def is_square(n):
     c = legendre(n)
     return c == GF(0) or c == GF(1)
 
 
+####################
+# Integer backends #
+####################
+# Field elements hold their value in a Python int by default, and
+# exponentiations run on CPython's generic bignum code.  The "gmpy2"
+# backend holds them in gmpy2.mpz instead: products, modular reductions,
+# exponentiations, inversions and Jacobi symbols then run on GMP.
+#
+# The backend is selected at import time with the ELLIGATOR_BACKEND
+# environment variable ("int" by default), or afterwards with
+# set_backend().  Contexts can also have their own backend, see
+# context.load().  When gmpy2 is not installed, the "gmpy2" backend
+# silently falls back to "int".
+#
+# Either way, to_num() returns a Python int: serialisation and test
+# vectors do not depend on the backend.  Note that GMP inversions and
+# Jacobi symbols are not constant time (neither is the rest of this
+# code).
+def jacobi_gmp(a, n):
+    """Jacobi symbol (a/n) computed by GMP, n must be odd and positive"""
+    count("jacobi")
+    return gmpy2.jacobi(a, n)
+
+def invert_gmp(self):
+    """Inverse computed by GMP (zero has no inverse, returns zero)"""
+    if self.val % self.modulus == 0:
+        return GF.raw(self.modulus * 0)
+    return GF.raw(gmpy2.invert(self.val, self.modulus))
+
+backend_names = ("int", "gmpy2")
+backends      = {
+    "int": (int, jacobi, {
+        '__pow__': GF.__pow__,
+        'invert' : GF.invert,
+    }),
+}
+if gmpy2 is not None:
+    backends["gmpy2"] = (gmpy2.mpz, jacobi_gmp, {
+        '__pow__': lambda self, s: GF.raw(gmpy2.powmod(self.val, s,
+                                                       self.modulus)),
+        'invert' : invert_gmp,
+    })
+
+def set_backend(name):
+    """Selects the integer backend ("int" or "gmpy2")
+
+    Returns the name of the backend actually selected ("int" when
+    gmpy2 is not installed).  Existing field elements stay valid.
+    """
+    global backend, jacobi_symbol
+    if name not in backend_names:
+        raise ValueError('Unknown integer backend: ' + name)
+    if name not in backends:
+        name = "int"
+    integer, jacobi_symbol, ops = backends[name]
+    for method, op in ops.items():
+        setattr(GF, method, op)
+    GF.integer = integer
+    if hasattr(GF, 'p'):
+        GF.modulus = integer(GF.p)
+    backend = name
+    return name
+
+set_backend(os.environ.get("ELLIGATOR_BACKEND", "int"))
+
+
 ###########################
 # Constant time selection #
 ###########################
@@ -163,6 +403,7 @@ def cswap(a, b, swap):
     Production code is supposed to run in constant time.
     Be aware that this code does not.
     """
+    count("cswap")
     if swap: return b, a
     else   : return a, b
 
@@ -178,10 +419,101 @@ def cmove(a, b, move):
     Production code is supposed to run in constant time.
     Be aware that this code does not.
     """
+    count("cmove")
     if move: return b
     else   : return a
 
 
+###################
+# Batch inversion #
+###################
+def batch_invert(elements):
+    """Inverts many field elements at once (Montgomery's trick)
+
+    Costs a single inversion, plus 3 multiplications per element.
+    Like GF.invert(), the inverse of zero is zero.
+
+    We first compute all the partial products e0*e1*...*ei, then
+    invert the full product, and walk back down the list:
+        inv(ei)          = inv(e0*...*ei) * (e0*...*ei-1)
+        inv(e0*...*ei-1) = inv(e0*...*ei) * ei
+    Zero elements are skipped, so they don't nullify the others.
+    """
+    products = []
+    acc      = GF(1)
+    for e in elements:
+        products.append(acc)
+        acc = cmove(acc * e, acc, e == GF(0))
+    inv      = acc.invert()
+    inverses = []
+    for e, product in zip(reversed(elements), reversed(products)):
+        inverses.append(cmove(inv * product, GF(0), e == GF(0)))
+        inv = cmove(inv * e, inv, e == GF(0))
+    inverses.reverse()
+    return inverses
+
+def batch_normalise(fractions):
+    """Computes n / d for each (n, d) in fractions, with one inversion
+
+    Typically used to convert many projective coordinates back to
+    affine coordinates.
+    """
+    inverses = batch_invert([d for _, d in fractions])
+    return [n * inv for (n, _), inv in zip(fractions, inverses)]
+
+
+###############
+# Self checks #
+###############
+class Checks():
+    """Verification level of the self checks
+
+    Not really a class.  Think of it as a namespace.
+
+    The reference code checks itself: points must stay on the curve,
+    and different methods must agree on the same results.  This costs
+    3 to 4 times the work of the fast methods alone.
+    The verification level is one of:
+    - "full"   : every call is checked (default)
+    - "sampled": a random sample of calls are checked (see rate)
+    - "off"    : nothing is checked
+    Checked functions also take a per call level (check=...),
+    which overrides the global level.
+    """
+    level    = "full"
+    rate     = 1 / 64
+    runs     = 0         # number of checks performed
+    failures = 0         # number of failed checks
+    random   = Random()  # independent from the test vectors' seed
+    lock     = Lock()
+
+    def enabled(level=None):
+        """Should we check the current call?"""
+        if level is None     : level = Checks.level
+        if level == "full"   : return True
+        if level == "off"    : return False
+        if level == "sampled": return Checks.random.random() < Checks.rate
+        raise ValueError('Unknown verification level')
+
+    def nested(level=None):
+        """Level for the sub-calls of a call (check all or nothing)"""
+        return "full" if Checks.enabled(level) else "off"
+
+    def verify(ok, message):
+        """Counts a check, raises ValueError(message) if it failed"""
+        with Checks.lock:
+            Checks.runs += 1
+            if not ok:
+                Checks.failures += 1
+        if not ok:
+            raise ValueError(message)
+
+    def reset():
+        with Checks.lock:
+            Checks.runs     = 0
+            Checks.failures = 0
+
+
 #################
 # Edwards curve #
 #################
@@ -195,73 +527,233 @@ class Ed():
     - lop       : low order point
     - to_mt     : convertion function from Edwards to montgomery
     - select_lop: fast low order point selection
+
+    Points use extended coordinates to avoid expensive divisions:
+        P = (X, Y, Z, T)
+        x = X / Z
+        y = Y / Z
+        x * y = T / Z
     """
+    def zero():
+        """Neutral element"""
+        return (GF(0), GF(1), GF(1), GF(0))
+
+    def from_affine(x, y):
+        """Converts affine coordinates to extended coordinates"""
+        return (x, y, GF(1), x * y)
+
     def add(p1, p2):
-        """Point addition, using projective coordinates
+        """Point addition, using extended coordinates
 
         Formula with affine coordinates:
             denum = d*x1*x2*y1*y2
             x     = (x1*y2 +   x2*y1) / (1 + denum)
             y     = (y1*y2 - a*x1*x2) / (1 - denum)
 
-        We use projective coordinates to avoid expensive divisions:
-            P = (X, Y, Z)
-            x = X / Z
-            y = Y / Z
+        With extended coordinates, d*x1*x2*y1*y2 becomes d*T1*T2, and
+        (x1*y2 + x2*y1) is computed with a single multiplication.
+        See https://eprint.iacr.org/2008/522 (section 3.1)
+        """
+        x1, y1, z1, t1 = p1
+        x2, y2, z2, t2 = p2
+        a = x1 * x2
+        b = y1 * y2
+        c = Ed.d * t1 * t2
+        d = z1 * z2
+        e = (x1 + y1) * (x2 + y2) - a - b  # x1*y2 + x2*y1
+        f = d - c
+        g = d + c
+        h = b - Ed.a * a
+        return (e*f, g*h, f*g, e*h)
+
+    def double(p):
+        """Point doubling, using extended coordinates
+
+        Same result as Ed.add(p, p), with fewer multiplications.
+        Only uses X, Y and Z.
+        See https://eprint.iacr.org/2008/522 (section 3.3)
         """
-        x1, y1, z1 = p1
-        x2, y2, z2 = p2
-        denum = Ed.d*x1*x2*y1*y2
-        t1    = z1 * z2
-        t2    = t1**2
-        xt    = t1 * (x1*y2 +        x2*y1)
-        yt    = t1 * (y1*y2 - Ed.a*x1*x2)
-        zx    = t2 + denum
-        zy    = t2 - denum
-        return (xt*zy, yt*zx, zx*zy)
+        x, y, z, _ = p
+        a = x**2
+        b = y**2
+        c = GF(2) * z**2
+        d = Ed.a * a
+        e = (x + y)**2 - a - b  # 2*x*y
+        g = d + b
+        f = g - c
+        h = d - b
+        return (e*f, g*h, f*g, e*h)
 
     def check_point(p):
         """Is the point on the curve?
 
-        Check that the point p (in projective coordinates to avoid
+        Check that the point p (in extended coordinates to avoid
         expensive divisions) matches the following twisted Edwards
         equation: a*x^2 + y^2 = 1 + d*x^2*y^2
+        Also check that x * y = T / Z
         """
-        x, y, z = p
+        x, y, z, t = p
         x2, y2, z2, z4 = (x**2, y**2, z**2, z**4)
-        if (Ed.a*x2 + y2)*z2 != z4 + Ed.d*x2*y2:
-            raise ValueError("Point not on the curve!!")
+        Checks.verify((Ed.a*x2 + y2)*z2 == z4 + Ed.d*x2*y2 and x*y == z*t,
+                      "Point not on the curve!!")
 
-    def scalarmult(point, scalar):
-        """Scalar multiplication in Edwards space"""
-        Ed.check_point(point)
-        acc    = (GF(0), GF(1), GF(1))
+    def negate(p):
+        """Opposite of a point"""
+        x, y, z, t = p
+        return (-x, y, z, -t)
+
+    def scalarmult_binary(point, scalar, check=None):
+        """Scalar multiplication in Edwards space (double and add)
+
+        One addition per set bit of the scalar.  Kept for comparison
+        with the wNAF method below.
+        """
+        checking = Checks.enabled(check)
+        if checking: Ed.check_point(point)
+        acc    = Ed.zero()
         binary = [int(c) for c in list(format(scalar, 'b'))]
         for i in binary:
-            acc = Ed.add(acc, acc)
-            Ed.check_point(acc)
+            acc = Ed.double(acc)
+            if checking: Ed.check_point(acc)
             if i == 1:
                 acc = Ed.add(acc, point)
-                Ed.check_point(acc)
+                if checking: Ed.check_point(acc)
         return acc
 
-    def co_scalarmult(scalar, c):
+    # Variable base scalar multiplication (width-w NAF)
+    #
+    # The scalar is recoded in signed digits, either zero or odd and
+    # within (-2^(w-1), 2^(w-1)).  Any w consecutive digits contain at
+    # most one non-zero digit, so we need about n/(w+1) additions
+    # instead of n/2.  The odd multiples P, 3P, 5P... are computed for
+    # each call, and negative digits use the opposite point for free.
+    #
+    # Small scalars (like cofactors) do not amortise the table, and
+    # use width 2 (plain NAF) instead.
+    #
+    # Like double and add, this is not constant time.
+    wnaf_width = 4
+
+    def wnaf(scalar, width):
+        """Width-w NAF of a non negative scalar, least significant first"""
+        if width < 2: raise ValueError('wNAF width must be at least 2')
+        digits = []
+        while scalar > 0:
+            if scalar & 1:
+                digit = scalar & ((1 << width) - 1)
+                if digit >= 1 << (width - 1):
+                    digit -= 1 << width
+                scalar -= digit
+            else:
+                digit = 0
+            digits.append(digit)
+            scalar >>= 1
+        return digits
+
+    def odd_multiples(point, width):
+        """The odd multiples P, 3P, 5P... (2^(w-1) - 1)P"""
+        table = [point]
+        if width > 2:
+            twice = Ed.double(point)
+            for _ in range((1 << (width - 2)) - 1):
+                table.append(Ed.add(table[-1], twice))
+        return table
+
+    def scalarmult(point, scalar, check=None, width=None):
+        """Scalar multiplication in Edwards space"""
+        checking = Checks.enabled(check)
+        if checking: Ed.check_point(point)
+        if width is None:
+            width = Ed.wnaf_width if scalar.bit_length() > 16 else 2
+        table  = Ed.odd_multiples(point, width)
+        acc    = Ed.zero()
+        for digit in reversed(Ed.wnaf(scalar, width)):
+            acc = Ed.double(acc)
+            if   digit > 0: acc = Ed.add(acc, table[ digit >> 1])
+            elif digit < 0: acc = Ed.add(acc, Ed.negate(table[-digit >> 1]))
+            if checking: Ed.check_point(acc)
+        return acc
+
+    # Fixed base scalar multiplication (comb method)
+    #
+    # The scalar is split in `comb_teeth` slices of `spacing` bits each.
+    # Bit i of every slice is gathered in an index, which selects the
+    # sum of the corresponding multiples of the base point in a table:
+    #
+    #     table[index] = sum(2^(j*spacing) * base
+    #                        for j in range(teeth) if index bit j is set)
+    #
+    # We then only need `spacing` doublings instead of one per bit,
+    # since every doubling advances all slices at once.
+    comb_teeth = 4     # table size is 2^comb_teeth points
+    comb       = None  # (base, spacing, table), built on first use
+
+    def comb_table(point, teeth, spacing):
+        """Table of the sums of the multiples 2^(j*spacing) of point"""
+        table = [Ed.zero()]
+        tooth = point
+        for j in range(teeth):
+            if j > 0:
+                for _ in range(spacing):
+                    tooth = Ed.double(tooth)
+            table = table + [Ed.add(p, tooth) for p in table]
+        for p in table:
+            Ed.check_point(p)
+        return table
+
+    def base_scalarmult(scalar, check=None):
+        """Scalar multiplication of the base point
+
+        Same result as Ed.scalarmult(Ed.base, scalar), only faster.
+        The table is computed once per curve.
+        """
+        teeth   = Ed.comb_teeth
+        spacing = -(-(GF.msb + 1) // teeth)  # ceil((msb+1) / teeth)
+        if scalar >= 2**(teeth * spacing):
+            return Ed.scalarmult(Ed.base, scalar, check)
+        if Ed.comb is None or Ed.comb[0] is not Ed.base:
+            table  = Ed.comb_table(Ed.base, teeth, spacing)
+            Ed.comb = (Ed.base, spacing, table)
+        table = Ed.comb[2]
+        acc   = Ed.zero()
+        for i in reversed(range(spacing)):
+            index = 0
+            for j in range(teeth):
+                index += ((scalar >> (i + j * spacing)) % 2) << j
+            point = table[0]
+            for k in range(1, len(table)):  # constant time selection
+                point = cmove(point, table[k], k == index)
+            acc = Ed.double(acc)
+            acc = Ed.add(acc, point)
+        if Checks.enabled(check):
+            Ed.check_point(acc)
+        return acc
+
+    def co_scalarmult_projective(scalar, c, check=None):
         """Scalarmult with cofactor
 
-        Returns a point converted to Montgomery.
+        Returns a point converted to Montgomery, in projective
+        coordinates (u = U / Z).
         There are two equivalent ways to select the low order point:
         - Scalar multiplication
         - Constant time selection from a table
         Selecting from a table is generally very simple and fast
         """
-        main_point  = Ed.scalarmult(Ed.base, clamp(scalar))
-        low_order1  = Ed.scalarmult(Ed.lop, c)
-        low_order2  = Ed.select_lop(c)
-        montgomery1 = Ed.to_mt(Ed.add(main_point, low_order1))
-        montgomery2 = Ed.to_mt(Ed.add(main_point, low_order2))
-        if montgomery1 != montgomery2:
-            raise ValueError('Incoherent low order point selection')
-        return montgomery1
+        check      = Checks.nested(check)
+        main_point = Ed.base_scalarmult(clamp(scalar), check)
+        low_order2 = Ed.select_lop(c)
+        u2, z2     = Ed.to_mt_projective(Ed.add(main_point, low_order2))
+        if check == "full":
+            low_order1 = Ed.scalarmult(Ed.lop, c, check)
+            u1, z1     = Ed.to_mt_projective(Ed.add(main_point, low_order1))
+            Checks.verify(u1 * z2 == u2 * z1,  # compare u1/z1 and u2/z2
+                          'Incoherent low order point selection')
+        return u2, z2
+
+    def co_scalarmult(scalar, c, check=None):
+        """Scalarmult with cofactor, returns a Montgomery u coordinate"""
+        u, z = Ed.co_scalarmult_projective(scalar, c, check)
+        return u / z
 
 
 ####################
@@ -272,39 +764,99 @@ class Mt():
 
     The following must be defined with monkey patching:
     - A     : curve constant
+    - a24   : (A+2)/4, used by the ladder
     - base_c: special base point that covers the whole curve
 
+    Points use projective coordinates (U, Z), with u = U / Z.
+
     The curve constant B is assumed equal to 1 (it has to be for the
     Montgomery curve to be compatible with Elligator2).
     """
-    def scalarmult(u, scalar):
+    def ladder_step(u, u2, z2, u3, z3):
+        """Montgomery ladder step: returns (P2*2, P2+P3)
+
+        Differential addition and doubling from RFC 7748, where
+        u is the difference P3-P2 (in affine coordinates).
+        Costs 5 multiplications, 4 squarings, and 1 multiplication
+        by the small constant a24 = (A+2)/4.
+        """
+        a  = u2 + z2
+        b  = u2 - z2
+        aa = a * a
+        bb = b * b
+        e  = aa - bb                 # 4 * u2 * z2
+        da = (u3 - z3) * a
+        cb = (u3 + z3) * b
+        s  = da + cb
+        d  = da - cb
+        return (aa * bb, e * (bb + Mt.a24 * e),
+                s  * s , d * d * u)
+
+    def scalarmult_projective(u, scalar):
         """Scalar multiplication in Montgomery space
 
         This is an "X-only" laddder, that only uses the u coordinate.
         This conflates points (u, v) and (u, -v).
+        Returns the result in projective coordinates.
         """
         u2, z2 = GF(1), GF(0) # "zero" point
         u3, z3 = u    , GF(1) # "one"  point
-        binary = [int(c) for c in list(format(scalar, 'b'))]
-        for b in binary:
+        swap   = 0
+        for i in reversed(range(scalar.bit_length())):
             # Montgomery ladder step:
             # if b == 0, then (P2, P3) == (P2*2 , P2+P3)
             # if b == 1, then (P2, P3) == (P2+P3, P3*2 )
-            swap   = b == 1  # Use constant time comparison
-            u2, u3 = cswap(u2, u3, swap)
-            z2, z3 = cswap(z2, z3, swap)
-            u3, z3 = ((u2*u3 - z2*z3)**2, (u2*z3 - z2*u3)**2 * u)
-            u2, z2 = ((u2**2 - z2**2)**2,
-                      GF(4)*u2*z2*(u2**2 + Mt.A*u2*z2 + z2**2))
+            # Swaps are deferred: we only swap when the bit changes.
+            b      = (scalar >> i) & 1
+            swap  ^= b
             u2, u3 = cswap(u2, u3, swap)
             z2, z3 = cswap(z2, z3, swap)
+            swap   = b
+            u2, z2, u3, z3 = Mt.ladder_step(u, u2, z2, u3, z3)
+        u2, u3 = cswap(u2, u3, swap)
+        z2, z3 = cswap(z2, z3, swap)
+        return u2, z2
+
+    def scalarmult_batch(us, scalars):
+        """Scalar multiplications in Montgomery space, in lockstep
+
+        Runs one ladder per (u, scalar) pair, all of them over the same
+        number of bits.  Leading zero bits only scale the projective
+        coordinates, so shorter scalars do not change the results.
+        All results share a single inversion.
+        """
+        ladders = [[u, GF(1), GF(0), u, GF(1)] for u in us]
+        swaps   = [0] * len(ladders)
+        nb_bits = max((s.bit_length() for s in scalars), default=0)
+        for i in reversed(range(nb_bits)):
+            for l, scalar in enumerate(scalars):
+                u, u2, z2, u3, z3 = ladders[l]
+                b         = (scalar >> i) & 1
+                swap      = swaps[l] ^ b
+                u2, u3    = cswap(u2, u3, swap)
+                z2, z3    = cswap(z2, z3, swap)
+                swaps[l]  = b
+                ladders[l][1:] = Mt.ladder_step(u, u2, z2, u3, z3)
+        points = []
+        for (u, u2, z2, u3, z3), swap in zip(ladders, swaps):
+            points.append((cswap(u2, u3, swap)[0], cswap(z2, z3, swap)[0]))
+        return batch_normalise(points)
+
+    def scalarmult(u, scalar):
+        """Scalar multiplication in Montgomery space"""
+        u2, z2 = Mt.scalarmult_projective(u, scalar)
         return u2 / z2
 
-    def co_scalarmult(scalar, c):
-        """Scalarmult with cofactor"""
+    def co_scalarmult_projective(scalar, c):
+        """Scalarmult with cofactor, in projective coordinates"""
         co_cleared = (c % Mt.cofactor) * Mt.order  # cleared main factor
         combined   = clamp(scalar) + co_cleared
-        return Mt.scalarmult(Mt.base_c, combined)
+        return Mt.scalarmult_projective(Mt.base_c, combined)
+
+    def co_scalarmult(scalar, c):
+        """Scalarmult with cofactor"""
+        u, z = Mt.co_scalarmult_projective(scalar, c)
+        return u / z
 
 
 ############################
@@ -317,9 +869,16 @@ class Mt():
 
 # Perform the different scalar multiplications and compare them.
 # All methods are supposed to yield the same results.
-def co_scalarmult(scalar, c):
-    p1 = Ed.co_scalarmult(scalar, c)
-    p2 = Mt.co_scalarmult(scalar, c)
-    if p1 != p2:
-        raise ValueError('Incoherent scalarmult')
+# (Only when checked, see Checks)
+def co_scalarmult(scalar, c, check=None):
+    check = Checks.nested(check)
+    p1    = Ed.co_scalarmult(scalar, c, check)
+    if check == "full":
+        p2 = Mt.co_scalarmult(scalar, c)
+        Checks.verify(p1 == p2, 'Incoherent scalarmult')
     return p1
+
+# Many scalar multiplications at once, sharing a single inversion
+def co_scalarmult_batch(scalars, cs):
+    points = [Ed.co_scalarmult_projective(s, c) for s, c in zip(scalars, cs)]
+    return batch_normalise(points)
@@ -57,7 +57,7 @@ from core import *
 ####################
 # field parameters #
 ####################
-GF.p = 2**255 - 19
+GF.set_p(2**255 - 19)
 
 def is_negative(self):
     """True iff self is in [p.+1 / 2.. p-1]
@@ -73,7 +73,8 @@ GF.is_negative = is_negative
 #########################
 # Square root functions #
 #########################
-sqrt_m1 = (GF(2)**((GF.p-1) // 4)).abs() # sqrt(-1)
+# sqrt(-1), non-negative (see self_test())
+sqrt_m1 = GF(19681161376707505956807079304988542015446066515923890162744021073123829784752)
 
 def sqrt(n):
     """ Non-negative square root of n
@@ -105,6 +106,7 @@ def inv_sqrt(x):
 
 core.sqrt     = sqrt
 core.inv_sqrt = inv_sqrt
+core.legendre = legendre_jacobi  # much faster than legendre_pow
 
 
 ##################
@@ -113,13 +115,18 @@ core.inv_sqrt = inv_sqrt
 def to_edwards(u):
     y = (u - GF(1)) / (u + GF(1))
     x = sqrt((y**2 - GF(1)) / (Ed.d * y**2 + GF(1)))
-    return (x, y, GF(1))
+    return Ed.from_affine(x, y)
+
+def to_montgomery_projective(point):
+    x, y, z, t = point  # in extended coordinates
+    return (z + y, z - y)
 
 def to_montgomery(point):
-    x, y, z = point  # in projective coordinates
-    return (z + y) / (z - y)
+    u, z = to_montgomery_projective(point)
+    return u / z
 
-Ed.to_mt = to_montgomery
+Ed.to_mt            = to_montgomery
+Ed.to_mt_projective = to_montgomery_projective
 
 
 ####################
@@ -127,11 +134,12 @@ Ed.to_mt = to_montgomery
 ####################
 
 # Montgomery constants (We already assume B = 1)
-Mt.A = GF(486662)
+Mt.A   = GF(486662)
+Mt.a24 = GF(121666)  # (A+2)/4
 
 # Twisted Edwards constants
 Ed.a = GF(-1)
-Ed.d = GF(-121665) / GF(121666)
+Ed.d = GF(37095705934669439343138083508754565189542113879843219016388785533085940283555)
 
 # curve order and cofactor
 Mt.order    = 2**252 + 27742317777372353535851937790883648493
@@ -139,22 +147,25 @@ Mt.cofactor = 8
 
 # Standard base point, that generates the prime order sub-group
 Mt.base = GF(9)                # Montgomery base point
-Ed.base = to_edwards(Mt.base)  # Edwards base point
+Ed.base = Ed.from_affine(      # Edwards base point
+    GF(15112221349535400772501151409588531511454012693041857206046113283949847762202),
+    GF(46316835694926478169428394003475163141307993866256225615783033603165251855960))
 
 # Low order point (of order 8), used to add the cofactor component
 # There are 4 such points, that differ only by the sign of
 # their coordinates: (x, y), (x, -y), (-x, y), (-x, -y)
 # We chose the one whose both coordinates are positive (below GF.p // 2)
-lop_x       = sqrt((sqrt(Ed.d + GF(1)) + GF(1)) / Ed.d)
-lop_y       = -lop_x * sqrt_m1
-Ed.lop = (lop_x, lop_y, GF(1))
+lop_x = GF(14399317868200118260347934320527232580618823971194345261214217575416788799818)
+lop_y = GF(2707385501144840649318225287225658788936804267575313519463743609750303402022)
+Ed.lop = Ed.from_affine(lop_x, lop_y)
 
 # "Dirty" Base point, that generates the whole curve.
 # Mt.base_c = Mt.base + (lop * co_clear)
 co_clear  = Mt.order % Mt.cofactor # 5
-lop_c     = Ed.scalarmult(Ed.lop, co_clear)
-Ed.base_c = Ed.add(Ed.base, lop_c)
-Mt.base_c = Ed.to_mt(Ed.base_c)
+Ed.base_c = Ed.from_affine(
+    GF(26222289456106274526776360614461724610067025394274937622548094723977875659714),
+    GF(13564023222050176697242799576963668605533369585058227603390195093552855082515))
+Mt.base_c = GF(53315860285189919089239497590085921958905393261225306850292972698633491875544)
 
 # Constant time selection of the low order point
 # Using tricks to minimise the size of the look up table
@@ -182,7 +193,7 @@ def select_lop(i):
         return r
     x = select(lop_x, sqrt_m1, i  )
     y = select(lop_y, GF(1)  , i+2)
-    return (x, y, GF(1))
+    return Ed.from_affine(x, y)
 
 Ed.select_lop = select_lop
 
@@ -192,4 +203,32 @@ Ed.select_lop = select_lop
 ########################
 core.Z       = GF(2)               # sqrt(-1) is sometimes faster...
 core.ufactor = -core.Z * sqrt_m1   # ...because then both ufactor
-core.vfactor = sqrt(core.ufactor)  # and vfactor are equal to 1
+core.vfactor = GF(19681161376707505956807079304988542015446066515923890162744021073123829784751)  # and vfactor are equal to 1
+
+
+##############
+# Self tests #
+##############
+# The constants above are frozen, so importing this module costs no
+# exponentiation or inversion.  self_test() derives them again from
+# their definitions, and checks they match.
+def self_test():
+    """Recomputes the frozen constants, raises ValueError on mismatch"""
+    def affine(point):
+        x, y, z, _ = point
+        return x / z, y / z
+    lop_c = Ed.scalarmult(Ed.lop, co_clear)
+    constants = [
+        ("sqrt_m1"  , sqrt_m1          , (GF(2)**((GF.p-1) // 4)).abs()),
+        ("Ed.d"     , Ed.d             , GF(-121665) / GF(121666)),
+        ("Ed.base"  , affine(Ed.base)  , affine(to_edwards(Mt.base))),
+        ("lop_x"    , lop_x            , sqrt((sqrt(Ed.d + GF(1)) + GF(1))
+                                              / Ed.d)),
+        ("lop_y"    , lop_y            , -lop_x * sqrt_m1),
+        ("Ed.base_c", affine(Ed.base_c), affine(Ed.add(Ed.base, lop_c))),
+        ("Mt.base_c", Mt.base_c        , Ed.to_mt(Ed.base_c)),
+        ("vfactor"  , core.vfactor     , sqrt(core.ufactor)),
+    ]
+    for name, frozen, computed in constants:
+        Checks.verify(frozen == computed, 'Wrong constant: ' + name)
+
@@ -73,7 +73,7 @@ isogeny = True
 ####################
 # field parameters #
 ####################
-GF.p = 2**448 - 2**224 - 1
+GF.set_p(2**448 - 2**224 - 1)
 
 def is_negative(self):
     """True iff self is odd"""
@@ -112,6 +112,7 @@ def inv_sqrt(x):
 
 core.sqrt     = sqrt
 core.inv_sqrt = inv_sqrt
+core.legendre = legendre_jacobi  # much faster than legendre_pow
 
 
 ################################
@@ -120,22 +121,28 @@ core.inv_sqrt = inv_sqrt
 def mt_to_edwards(u):
     y = (u + GF(1)) / (u - GF(1))
     x = sqrt((y**2 - GF(1)) / (Ed.d * y**2 - GF(1)))
-    return (x, y, GF(1))
+    return Ed.from_affine(x, y)
+
+# sqrt(-39081), the square root of the Ed448 curve constant d
+sqrt_d = GF(98944233647732219769177004876929019128417576295529901074099889598043702116001257856802131563896515373927712232092845883226922417596214)
 
 def isogeny_to_ed(point):
-    x, y, z = point
+    x, y, z, t = point
     x2 = x**2
     y2 = y**2
-    du = z**2*GF(2) - x2 - y2
-    v  = y2 - x2 # dv, actually. We use v to save space
-    d  = du * v
-    u  = v * x * y * GF(2)*sqrt(Ed.d)
-    v  = (y2 + x2) * du
-    return (u, v, d)
+    du = z**2*GF(2) - x2 - y2    # denominator of u
+    dv = y2 - x2                 # denominator of v
+    nu = x * y * GF(2) * sqrt_d  # numerator   of u
+    nv = y2 + x2                 # numerator   of v
+    return (nu * dv, nv * du, du * dv, nu * nv)
+
+def edwards_to_mt_projective(point):
+    x, y, z, t = point  # in extended coordinates
+    return (y + z, y - z)
 
 def edwards_to_mt(point):
-    x, y, z = point  # in projective coordinates
-    return (y + z) / (y - z)
+    u, z = edwards_to_mt_projective(point)
+    return u / z
 
 
 ####################
@@ -143,12 +150,13 @@ def edwards_to_mt(point):
 ####################
 
 # Montgomery constants (We already assume B = 1)
-Mt.A = GF(156326)
+Mt.A   = GF(156326)
+Mt.a24 = GF(39082)  # (A+2)/4
 
 # Edwards constants
 Ed.a = GF(1) # 1 -> not twisted
 if isogeny: Ed.d = GF(-39081)
-else      : Ed.d = GF(39082) / GF(39081)
+else      : Ed.d = GF(611975850744529176160423220965553317543219696871016626328968936415087860042636474891785599283666020414768678979989378147065462815545017)  # 39082 / 39081
 
 # curve order and cofactor
 Mt.order    = 2**446-0x8335dc163bb124b65129c96fde933d8d723a70aadc873d6d54a7bb0d
@@ -158,60 +166,66 @@ Mt.cofactor = 4
 Mt.base = GF(5)
 if isogeny:
     # From RFC 8032
-    Ed.base = (GF(224580040295924300187604334099896036246789641632564134246125461686950415467406032909029192869357953282578032075146446173674602635247710),
-               GF(298819210078481492676017930443930673437544040154080242095928241372331506189835876003536878655418784733982303233503462500531545062832660),
-               GF(1))
+    Ed.base = Ed.from_affine(
+        GF(224580040295924300187604334099896036246789641632564134246125461686950415467406032909029192869357953282578032075146446173674602635247710),
+        GF(298819210078481492676017930443930673437544040154080242095928241372331506189835876003536878655418784733982303233503462500531545062832660))
 else:
     # Base point of the (non-standard) birational curve
-    Ed.base = mt_to_edwards(Mt.base)
+    Ed.base = Ed.from_affine(  # mt_to_edwards(Mt.base)
+        GF(345397493039729516374008604150537410266655260075183290216406970281645695073672344430481787759340633221708391583424041788924124567700732),
+        GF(363419362147803445274661903944002267176820680343659030140745099590306164083365386343198191849338272965044442230921818680526749009182721))
 
 # Low order point (of order 4), used to add the cofactor component
 # There are 2 such points: (1, 0) and (-1, 0)
 # We chose (1, 0) somewhat arbitrarily
-Ed.lop = (GF(1), GF(0), GF(1))
+Ed.lop = Ed.from_affine(GF(1), GF(0))
 
 # "Dirty" Base point, that generates the whole curve.
 # mt_base_c = mt_base + (lop * co_clear)
+# Both alternatives give the same results.
 co_clear  = Mt.order % Mt.cofactor # 3
-lop_c     = Ed.scalarmult(Ed.lop, co_clear)
-ed_base   = isogeny_to_ed(Ed.base) if isogeny else Ed.base
-Ed.base_c = Ed.add(ed_base, lop_c)
-Mt.base_c = edwards_to_mt(Ed.base_c)
+Ed.base_c = Ed.from_affine(
+    GF(363419362147803445274661903944002267176820680343659030140745099590306164083365386343198191849338272965044442230921818680526749009182718),
+    GF(345397493039729516374008604150537410266655260075183290216406970281645695073672344430481787759340633221708391583424041788924124567700732))
+Mt.base_c = GF(284926390974837292580902741020352466934112412198492578047426886951351018799021072222778755168649464863442075375759097193918879068423582)
 
 def add_lop(point, i):
     """Adding a low order point, fast
 
     # Equivalent to the following, except constant time
     x, y, z = point
-    if i == 0: return  x,  y, z
-    if i == 1: return  y, -x, z
-    if i == 2: return -x, -y, z
-    if i == 3: return -y,  x, z
+    if i == 0: return  x,  y, z,  t
+    if i == 1: return  y, -x, z, -t
+    if i == 2: return -x, -y, z,  t
+    if i == 3: return -y,  x, z, -t
     """
-    x, y, z = point
+    x, y, z, t = point
     l    = (i//1) % 2 == 1
     h    = (i//2) % 2 == 1
     x, y = cswap(x, y, l)
     x    = cmove(x, -x, h)
     y    = cmove(y, -y, l != h) # use XOR instead of !=
-    return x, y, z
+    t    = cmove(t, -t, l)
+    return x, y, z, t
 
-# Replacing the generic Ed.co_scalarmult()
+# Replacing the generic Ed.co_scalarmult_projective()
 # with a custom method that uses the fast add_lop()
 # instead of the regular select_lop() then add().
 # This saves a full point addition.
-def co_scalarmult(scalar, c):
-    main_point  = Ed.scalarmult(Ed.base, clamp(scalar))
+def co_scalarmult_projective(scalar, c, check=None):
+    check      = Checks.nested(check)
+    main_point = Ed.base_scalarmult(clamp(scalar), check)
     if isogeny:
         main_point = isogeny_to_ed(main_point)
-    low_order_p = Ed.scalarmult(Ed.lop, c)
-    montgomery1 = edwards_to_mt(Ed.add(main_point, low_order_p)) # slow
-    montgomery2 = edwards_to_mt(add_lop(main_point, c))          # fast
-    if montgomery1 != montgomery2:
-        raise ValueError('Incoherent low order point selection')
-    return montgomery2
+    u2, z2 = edwards_to_mt_projective(add_lop(main_point, c))  # fast
+    if check == "full":
+        low_order_p = Ed.scalarmult(Ed.lop, c, check)
+        u1, z1      = edwards_to_mt_projective(Ed.add(main_point, low_order_p))
+        Checks.verify(u1 * z2 == u2 * z1,  # compare u1/z1 and u2/z2
+                      'Incoherent low order point selection')
+    return u2, z2
 
-Ed.co_scalarmult = co_scalarmult
+Ed.co_scalarmult_projective = co_scalarmult_projective
 
 
 ########################
@@ -219,4 +233,32 @@ Ed.co_scalarmult = co_scalarmult
 ########################
 core.Z       = GF(-1)
 core.ufactor = -core.Z            # ufactor ==  1
-core.vfactor = sqrt(core.ufactor) # vfactor == -1
+core.vfactor = GF(-1)             # vfactor == -1 == sqrt(ufactor)
+
+
+##############
+# Self tests #
+##############
+# The constants above are frozen, so importing this module costs no
+# exponentiation or inversion.  self_test() derives them again from
+# their definitions, and checks they match.
+def self_test():
+    """Recomputes the frozen constants, raises ValueError on mismatch"""
+    def affine(point):
+        x, y, z, _ = point
+        return x / z, y / z
+    lop_c     = Ed.scalarmult(Ed.lop, co_clear)
+    ed_base   = isogeny_to_ed(Ed.base) if isogeny else Ed.base
+    constants = [
+        ("Ed.base_c", affine(Ed.base_c), affine(Ed.add(ed_base, lop_c))),
+        ("Mt.base_c", Mt.base_c        , edwards_to_mt(Ed.base_c)),
+        ("vfactor"  , core.vfactor     , sqrt(core.ufactor)),
+    ]
+    if isogeny:
+        constants.append(("sqrt_d" , sqrt_d, sqrt(Ed.d)))
+    else:
+        constants.append(("Ed.d"   , Ed.d  , GF(39082) / GF(39081)))
+        constants.append(("Ed.base", affine(Ed.base),
+                          affine(mt_to_edwards(Mt.base))))
+    for name, frozen, computed in constants:
+        Checks.verify(frozen == computed, 'Wrong constant: ' + name)
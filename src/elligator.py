@@ -79,7 +79,7 @@ def rev_map_ref(u, v_is_negative):
 
     Returns None if the point cannot be mapped.
     """
-    if u == -A or not is_square(-Z * u * (u+A)):
+    if not is_mappable(u):
         return None
     sq1 = sqrt(-u     / (Z * (u+A)))
     sq2 = sqrt(-(u+A) / (Z * u    ))
@@ -89,6 +89,15 @@ def rev_map_ref(u, v_is_negative):
     return rep
 
 
+def is_mappable(u):
+    """Can the point (u, v) be mapped back to a representative?
+
+    The answer is the same for both signs of v.  This is much cheaper
+    than rev_map_fast(): no square root, just a Legendre symbol.
+    """
+    return u != -A and is_square(-Z * u * (u+A))
+
+
 ###########################################
 # Fast Implementation (explicit formulas) #
 ###########################################
@@ -143,23 +152,28 @@ def rev_map_fast(u, v_is_negative):
 ################################
 # Compare both implementations #
 ################################
-def dir_map(r):
-    p_ref  = dir_map_ref(r)
+# (Only when checked, see Checks.  Otherwise we use the fast version.)
+def dir_map(r, check=None):
     p_fast = dir_map_fast(r)
+    if not Checks.enabled(check):
+        return p_fast
+    p_ref  = dir_map_ref(r)
     p_neg  = dir_map_fast(-r)
     u, v   = p_ref
     r_back = rev_map_fast(u, v.is_negative())
-    if p_ref  != p_fast : raise ValueError('ref/fast map mismatch')
-    if p_ref  != p_neg  : raise ValueError('+r/-r map mismatch')
-    if r_back != r.abs(): raise ValueError('roundtrip map mismatch')
+    Checks.verify(p_ref  == p_fast , 'ref/fast map mismatch')
+    Checks.verify(p_ref  == p_neg  , '+r/-r map mismatch')
+    Checks.verify(r_back == r.abs(), 'roundtrip map mismatch')
     return p_ref
 
-def rev_map(u, v_is_negative):
-    r_ref  = rev_map_ref (u, v_is_negative)
+def rev_map(u, v_is_negative, check=None):
     r_fast = rev_map_fast(u, v_is_negative)
-    if r_ref != r_fast: raise ValueError('r mismatch (ref vs fast rev_map')
+    if not Checks.enabled(check):
+        return r_fast
+    r_ref  = rev_map_ref (u, v_is_negative)
+    Checks.verify(r_ref == r_fast, 'r mismatch (ref vs fast rev_map')
     if r_ref:
         u_back, v_back = dir_map_fast(r_ref)
-        if u_back != u or v_back.is_negative() != v_is_negative:
-            raise ValueError('roundtrip mismatch (rev_map)')
+        Checks.verify(u_back == u and v_back.is_negative() == v_is_negative,
+                      'roundtrip mismatch (rev_map)')
     return r_ref
@@ -54,8 +54,9 @@
 import sys
 
 # collect arguments
-if len(sys.argv) < 3:
-    raise ValueError('Usage: gen_vectors.py curve vectors')
+if len(sys.argv) < 3 or len(sys.argv) == 4:
+    raise ValueError('Usage: gen_vectors.py curve vectors '
+                     '[first last [seed [jobs]]]')
 curve   = sys.argv[1]
 vectors = sys.argv[2]
 
@@ -65,14 +66,22 @@ elif curve == "curve448"  : from curve448   import *
 else: raise ValueError('Uknnown curve module')
 
 # remaining imports
-from elligator import *
-from random    import randrange
-from random    import seed
+from concurrent.futures import ProcessPoolExecutor
+from elligator          import *
+from random             import Random
+from random             import randrange
+from random             import seed
 
 
 ##############
 # Direct map #
 ##############
+def direct_map_vector(randrange):
+    """Test vector for the direct map, for a random representative"""
+    r    = GF(randrange(0, GF.p - 1)).abs()
+    u, v = dir_map(r)
+    return vectors_to_string([r, u, v])
+
 def direct_map_all_vectors():
     """All test vectors for the direct map"""
     seed(12345)  # cheap determinism for the random test vectors
@@ -83,9 +92,7 @@ def direct_map_all_vectors():
 
     # Random representatives map to their respective point
     for _ in range(256):
-        r    = GF(randrange(0, GF.p - 1)).abs()
-        u, v = dir_map(r)
-        vectors.append(vectors_to_string([r, u, v]))
+        vectors.append(direct_map_vector(randrange))
 
     return "\n\n".join(vectors)
 
@@ -93,12 +100,28 @@ def direct_map_all_vectors():
 ###############
 # Reverse map #
 ###############
-def random_curve_point():
+def random_curve_point(randrange):
     u = GF(randrange(0, GF.p - 1))
     while not is_square(u**3 + A * u**2 + B * u):
         u = GF(randrange(0, GF.p - 1))
     return u
 
+def reverse_map_vectors(u):
+    """Test vectors for both signs of v (the map may fail)"""
+    rp = rev_map(u, False)
+    rn = rev_map(u, True)
+    if rp is None:
+        if not rn is None: raise ValueError('Reverse map should fail')
+        return "\n\n".join([vectors_to_string([u, False, "ff:", ":"]),
+                            vectors_to_string([u, True , "ff:", ":"])])
+    if rn is None: raise ValueError('Reverse map should succeed')
+    return "\n\n".join([vectors_to_string([u, False, "00:", rp]),
+                        vectors_to_string([u, True , "00:", rn])])
+
+def reverse_map_vector(randrange):
+    """Test vectors for a random point (the map fails half the time)"""
+    return reverse_map_vectors(random_curve_point(randrange))
+
 def reverse_map_all_vectors():
     """All test vectors for the reverse map"""
     seed(12345)  # cheap determinism for the random test vectors
@@ -109,27 +132,17 @@ def reverse_map_all_vectors():
 
     # some points that do not map
     for i in range(16):
-        u = random_curve_point()
-        r = rev_map(u, False)
-        while not r is None:
-            u = random_curve_point()
-            r = rev_map(u, False)
-        if not rev_map(u, True) is None:
-            raise ValueError('Reverse map should fail')
-        vectors.append(vectors_to_string([u, False, "ff:", ":"]))
-        vectors.append(vectors_to_string([u, True , "ff:", ":"]))
+        u = random_curve_point(randrange)
+        while is_mappable(u):
+            u = random_curve_point(randrange)
+        vectors.append(reverse_map_vectors(u))
 
     # lots of points that do map
     for i in range(256):
-        u  = random_curve_point()
-        rp = rev_map(u, False)
-        while rp is None:
-            u  = random_curve_point()
-            rp = rev_map(u, False)
-        rn = rev_map(u, True)
-        if rn is None: raise ValueError('Reverse map should succeed')
-        vectors.append(vectors_to_string([u, False, "00:", rp]))
-        vectors.append(vectors_to_string([u, True , "00:", rn]))
+        u = random_curve_point(randrange)
+        while not is_mappable(u):
+            u = random_curve_point(randrange)
+        vectors.append(reverse_map_vectors(u))
 
     return "\n\n".join(vectors)
 
@@ -137,27 +150,68 @@ def reverse_map_all_vectors():
 ##############
 # Scalarmult #
 ##############
+def scalarmult_vector(i, randrange):
+    """Test vector for scalar multiplication (cofactor i % h)"""
+    c      = i % Mt.cofactor
+    scalar = randrange(2**(GF.nb_bytes * 8))      # lower bits = random
+    scalar = scalar // Mt.cofactor * Mt.cofactor  # lower bits = 0
+    scalar = scalar + c                           # lower bits = c
+    return vectors_to_string([scalar, co_scalarmult(scalar, c)])
+
 def scalarmult_all_vectors():
     """All test vectors for scalar multiplication"""
     seed(12345)  # cheap determinism for the random test vectors
     vectors = []
     for i in range(64):
-        c      = i % Mt.cofactor
-        scalar = randrange(2**(GF.nb_bytes * 8))      # lower bits = random
-        scalar = scalar // Mt.cofactor * Mt.cofactor  # lower bits = 0
-        scalar = scalar + c                           # lower bits = c
-        vectors.append(vectors_to_string([
-            scalar,
-            co_scalarmult(scalar, c)
-        ]))
+        vectors.append(scalarmult_vector(i, randrange))
     return "\n\n".join(vectors)
 
 
+######################
+# Indexed generation #
+######################
+
+# Test vector i only depends on (seed, i), so we can generate any range
+# of test vectors in any order: in parallel, or in separate shards that
+# are simply concatenated afterwards.  Vectors are streamed to the
+# standard output in order, one window at a time, so memory use stays
+# bounded no matter how many vectors we generate.
+#
+# Each vector (two for the inverse map) is followed by an empty line.
+def indexed_vector(kind, rng_seed, i):
+    """Test vector number i"""
+    rng = Random("{}:{}:{}".format(rng_seed, kind, i))
+    if kind == "direct"    : return direct_map_vector (rng.randrange)
+    if kind == "inverse"   : return reverse_map_vector(rng.randrange)
+    if kind == "scalarmult": return scalarmult_vector (i, rng.randrange)
+    raise ValueError('Unknown vectors')
+
+def indexed_vectors(kind, first, last, rng_seed, jobs):
+    """Streams test vectors first to last-1 to the standard output"""
+    window = 64 * jobs
+    with ProcessPoolExecutor(jobs) as executor:
+        for start in range(first, last, window):
+            indices = range(start, min(start + window, last))
+            args    = ([kind] * len(indices), [rng_seed] * len(indices))
+            for vector in executor.map(indexed_vector, *args, indices,
+                                       chunksize=16):
+                sys.stdout.write(vector + "\n\n")
+            sys.stdout.flush()
+
+
 ################
 # Main program #
 ################
-vectors_map = {"direct"    : direct_map_all_vectors,
-               "inverse"   : reverse_map_all_vectors,
-               "scalarmult": scalarmult_all_vectors,
-               }
-print(vectors_map[vectors]())
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        first    = int(sys.argv[3])
+        last     = int(sys.argv[4])
+        rng_seed = sys.argv[5]      if len(sys.argv) > 5 else "12345"
+        jobs     = int(sys.argv[6]) if len(sys.argv) > 6 else 1
+        indexed_vectors(vectors, first, last, rng_seed, jobs)
+    else:
+        vectors_map = {"direct"    : direct_map_all_vectors,
+                       "inverse"   : reverse_map_all_vectors,
+                       "scalarmult": scalarmult_all_vectors,
+                       }
+        print(vectors_map[vectors]())
@@ -0,0 +1,289 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import context
+import hashlib
+import key_exchange
+import math
+import time
+
+# Hidden handshakes behind an asyncio front end
+#
+# A single shared secret costs milliseconds of pure computation, which
+# would block the event loop if we computed it inline.  The Batcher
+# below collects requests into micro-batches, and sends each batch to
+# a pool of processes.  A batch leaves when it is full, or when its
+# oldest request has waited long enough, whichever comes first.
+# Batching amortises the cost of inter process communication, and
+# lets the workers share inversions (see key_exchange.shared_secrets()).
+#
+#     async with Batcher("curve25519") as batcher:
+#         u = await batcher.direct_map(representative)
+#         k = await batcher.shared_secret(secret_key, representative)
+#
+# Running this module starts a loopback server and a load generator,
+# and reports handshakes per second and latencies as the number of
+# concurrent clients grows.  No external service is needed.
+#
+#     ./handshake.py curve25519 --concurrency 1 4 16 64
+
+
+##################
+# Worker process #
+##################
+def direct_maps(curve, representatives):
+    return [key_exchange.direct_map(curve, r) for r in representatives]
+
+def shared_secrets(curve, requests):
+    secret_keys, representatives = zip(*requests)
+    return key_exchange.shared_secrets(curve, secret_keys, representatives)
+
+operations = {"direct_map"   : direct_maps,
+              "shared_secret": shared_secrets,
+              }
+
+
+###########
+# Batcher #
+###########
+class Batcher():
+    """Groups requests into micro-batches, computed by a process pool
+
+    max_batch: maximum number of requests per batch
+    max_delay: maximum time (in seconds) a request waits for its batch
+    """
+    def __init__(self, curve, max_batch=32, max_delay=0.002, workers=None):
+        self.curve     = curve
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor  = ProcessPoolExecutor(workers)
+        self.pending   = {name: [] for name in operations}
+        self.timers    = {name: None for name in operations}
+        self.batches   = 0   # number of batches sent
+        self.requests  = 0   # number of requests sent
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception):
+        self.close()
+
+    def close(self):
+        for name in operations:
+            self.flush(name)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def direct_map(self, representative):
+        """Public key (u) of a representative"""
+        return await self.submit("direct_map", bytes(representative))
+
+    async def shared_secret(self, secret_key, representative):
+        """Shared secret between a secret key and a representative"""
+        return await self.submit("shared_secret",
+                                 (bytes(secret_key), bytes(representative)))
+
+    def submit(self, name, request):
+        loop    = asyncio.get_running_loop()
+        future  = loop.create_future()
+        pending = self.pending[name]
+        pending.append((request, future))
+        if len(pending) >= self.max_batch:
+            self.flush(name)
+        elif self.timers[name] is None:
+            self.timers[name] = loop.call_later(self.max_delay,
+                                                self.flush, name)
+        return future
+
+    def flush(self, name):
+        """Sends the pending requests of an operation to the pool"""
+        if self.timers[name] is not None:
+            self.timers[name].cancel()
+            self.timers[name] = None
+        batch = self.pending[name]
+        if not batch:
+            return
+        self.pending[name] = []
+        self.batches      += 1
+        self.requests     += len(batch)
+        requests           = [request for request, _ in batch]
+        loop               = asyncio.get_running_loop()
+        try:
+            result = loop.run_in_executor(self.executor, operations[name],
+                                          self.curve, requests)
+        except Exception as exception:  # closed, or broken pool
+            self.fail(batch, exception)
+            return
+        result.add_done_callback(lambda r: self.done(batch, r))
+
+    def done(self, batch, result):
+        """Hands the results of a batch to the waiting requests"""
+        if result.cancelled():  # close() cancels the queued batches
+            self.fail(batch, RuntimeError('Batcher closed'))
+        elif result.exception() is not None:
+            self.fail(batch, result.exception())
+        else:
+            for (_, future), value in zip(batch, result.result()):
+                if not future.done():  # skip cancelled requests
+                    future.set_result(value)
+
+    def fail(self, batch, exception):
+        """Fails every waiting request of a batch"""
+        for _, future in batch:
+            if not future.done():  # skip cancelled requests
+                future.set_exception(exception)
+
+
+######################
+# Loopback handshake #
+######################
+# The client sends its representative, the server answers with its own
+# representative, followed by a hash of the shared secret (so the
+# client can check the server computed it right).
+def confirmation(shared_secret):
+    return hashlib.blake2b(shared_secret, digest_size=16).digest()
+
+async def serve(batcher, size, secret_key, representative):
+    """Starts the handshake server on a free local port"""
+    async def handle(reader, writer):
+        try:
+            theirs = await reader.readexactly(size)
+            key    = await batcher.shared_secret(secret_key, theirs)
+            writer.write(representative + confirmation(key))
+            await writer.drain()
+        finally:
+            writer.close()
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+async def client(port, size, key_pairs, count, latencies, failures):
+    """Performs count handshakes in a row, records their latencies
+
+    key_pairs are (representative, secret_key, expected_confirmation).
+    The expected confirmation is computed in advance, so the client
+    does no expensive computation while we measure.
+    """
+    for i in range(count):
+        representative, _, expected = key_pairs[i % len(key_pairs)]
+        start          = time.perf_counter()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(representative)
+        await writer.drain()
+        answer = await reader.readexactly(size + 16)
+        writer.close()
+        latencies.append(time.perf_counter() - start)
+        if answer[size:] != expected:
+            failures.append(i)
+
+def percentile(sorted_samples, p):
+    """Nearest rank percentile"""
+    rank = math.ceil(p / 100 * len(sorted_samples)) - 1
+    return sorted_samples[max(rank, 0)]
+
+async def load_test(curve, levels, handshakes, max_batch, max_delay,
+                    workers):
+    ctx                = context.load(curve)
+    ctx.Checks.level   = "off"
+    size               = ctx.GF.nb_bytes
+    server_r, server_s = key_exchange.key_pair(curve)
+    key_pairs = []
+    for _ in range(16):
+        r, s   = key_exchange.key_pair(curve)
+        shared = key_exchange.shared_secret(curve, s, server_r)
+        key_pairs.append((r, s, confirmation(shared)))
+    async with Batcher(curve, max_batch, max_delay, workers) as batcher:
+        server = await serve(batcher, size, server_s, server_r)
+        port   = server.sockets[0].getsockname()[1]
+        await client(port, size, key_pairs, 4, [], [])  # warm up the pool
+        for concurrency in levels:
+            latencies = []
+            failures  = []
+            batches   = batcher.batches
+            requests  = batcher.requests
+            count     = max(1, handshakes // concurrency)
+            start     = time.perf_counter()
+            await asyncio.gather(*[client(port, size, key_pairs, count,
+                                          latencies, failures)
+                                   for _ in range(concurrency)])
+            seconds   = time.perf_counter() - start
+            latencies.sort()
+            mean_batch = ((batcher.requests - requests)
+                          / max(batcher.batches - batches, 1))
+            print("{:>5} clients {:>9.1f} handshakes/s   p50 {:>8.2f} ms"
+                  "   p99 {:>8.2f} ms   batch {:>5.1f}   failures {}".format(
+                      concurrency, len(latencies) / seconds,
+                      percentile(latencies, 50) * 1e3,
+                      percentile(latencies, 99) * 1e3,
+                      mean_batch, len(failures)))
+        server.close()
+        await server.wait_closed()
+
+
+################
+# Main program #
+################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Handshake load test')
+    parser.add_argument('curve'        , choices=context.curves)
+    parser.add_argument('--concurrency', type=int, nargs='*',
+                        default=[1, 4, 16, 64])
+    parser.add_argument('--handshakes' , type=int, default=256,
+                        help='handshakes per concurrency level')
+    parser.add_argument('--batch'      , type=int, default=32)
+    parser.add_argument('--delay'      , type=float, default=0.002,
+                        help='maximum wait for a batch, in seconds')
+    parser.add_argument('--workers'    , type=int)
+    args = parser.parse_args()
+    asyncio.run(load_test(args.curve, args.concurrency, args.handshakes,
+                          args.batch, args.delay, args.workers))
@@ -0,0 +1,259 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import core
+import hashlib
+from core import *
+
+# Hash to curve, as specified in RFC 9380
+#
+# This module is curve agnostic: it works with whatever curve module
+# was imported first.  The curve specific suites (and the maps to
+# Edwards curves) are in hash_to_curve25519.py and hash_to_curve448.py.
+#
+# Messages can be arbitrarily big.  They are never buffered whole:
+# they may be given as bytes, as a binary file (anything with a read()
+# method), or as an iterable of byte strings, and are fed to the hash
+# function piece by piece.
+#
+# Points on the Montgomery curve are affine (x, y) pairs of field
+# elements, or None for the point at infinity.
+
+chunk_size = 2**16  # bytes read from files at a time
+
+
+###################
+# Message streams #
+###################
+def message_chunks(msg):
+    """The message, as a sequence of byte strings"""
+    if isinstance(msg, (bytes, bytearray, memoryview)):
+        yield msg
+    elif hasattr(msg, "read"):
+        while True:
+            chunk = msg.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from msg
+
+def i2osp(n, length):
+    return n.to_bytes(length, 'big')
+
+def os2ip(data):
+    return int.from_bytes(data, 'big')
+
+
+####################
+# Expand a message #
+####################
+def expand_message_xmd(msg, dst, length, hash=hashlib.sha512):
+    """expand_message_xmd() from RFC 9380, section 5.3.1"""
+    if len(dst) == 0:
+        raise ValueError('Domain separation tags must not be empty')
+    b_size = hash().digest_size   # b_in_bytes
+    s_size = hash().block_size    # s_in_bytes
+    ell    = -(-length // b_size)
+    if ell > 255 or length > 65535:
+        raise ValueError('Requested length is too big')
+    if len(dst) > 255:
+        dst = hash(b"H2C-OVERSIZE-DST-" + dst).digest()
+    dst_prime = dst + i2osp(len(dst), 1)
+    h = hash(bytes(s_size))       # Z_pad
+    for chunk in message_chunks(msg):
+        h.update(chunk)
+    h.update(i2osp(length, 2) + i2osp(0, 1) + dst_prime)
+    b_0    = h.digest()
+    b_i    = hash(b_0 + i2osp(1, 1) + dst_prime).digest()
+    blocks = [b_i]
+    for i in range(2, ell + 1):
+        xored = bytes(x ^ y for x, y in zip(b_0, b_i))
+        b_i   = hash(xored + i2osp(i, 1) + dst_prime).digest()
+        blocks.append(b_i)
+    return b"".join(blocks)[:length]
+
+def expand_message_xof(msg, dst, length, xof=hashlib.shake_256, k=224):
+    """expand_message_xof() from RFC 9380, section 5.3.2"""
+    if len(dst) == 0:
+        raise ValueError('Domain separation tags must not be empty')
+    if length > 65535:
+        raise ValueError('Requested length is too big')
+    if len(dst) > 255:
+        dst = xof(b"H2C-OVERSIZE-DST-" + dst).digest(-(-2 * k // 8))
+    h = xof()
+    for chunk in message_chunks(msg):
+        h.update(chunk)
+    h.update(i2osp(length, 2) + dst + i2osp(len(dst), 1))
+    return h.digest(length)
+
+
+#################
+# Hash to field #
+#################
+def hash_to_field(msg, count, dst, expand, k):
+    """hash_to_field() from RFC 9380, section 5.2 (prime fields only)
+
+    expand is expand_message_xmd() or expand_message_xof(),
+    and k the security level in bits.
+    """
+    length  = -(-(GF.p.bit_length() + k) // 8)  # L
+    uniform = expand(msg, dst, length * count)
+    return [GF(os2ip(uniform[i * length : (i + 1) * length]))
+            for i in range(count)]
+
+
+################
+# Map to curve #
+################
+def sgn0(x):
+    """Sign of x, as defined by RFC 9380 (parity of the representative)"""
+    return x.to_num() % 2
+
+def map_to_curve_elligator2(u):
+    """Elligator 2, the way RFC 9380 (section 6.7.1) specifies it
+
+    This is the same map as dir_map(), except for the sign of v: v is
+    odd when the first candidate is chosen, even otherwise.
+    """
+    A   = Mt.A
+    tv1 = core.Z * u**2
+    e1  = tv1 == GF(-1)                  # Use constant time comparison
+    tv1 = cmove(tv1, GF(0), e1)
+    x1  = -A / (GF(1) + tv1)
+    gx1 = x1**3 + A * x1**2 + x1
+    x2  = -x1 - A
+    gx2 = tv1 * gx1
+    e2  = is_square(gx1)
+    x   = cmove(x2 , x1 , e2)
+    y2  = cmove(gx2, gx1, e2)
+    y   = sqrt(y2)
+    e3  = sgn0(y) == 1
+    y   = cmove(y, -y, e2 != e3)         # Use XOR instead of !=
+    return x, y
+
+
+#############################
+# Montgomery point addition #
+#############################
+# Affine formulas, with B = 1.  They need an inversion per addition
+# or doubling.  This is fine for the few operations needed here.
+def mt_add(p1, p2):
+    """Sum of two points on the Montgomery curve"""
+    if p1 is None: return p2
+    if p2 is None: return p1
+    x1, y1 = p1
+    x2, y2 = p2
+    if x1 == x2:
+        if y1 == y2 and y1 != GF(0):
+            return mt_double(p1)
+        return None                      # p1 == -p2
+    l  = (y2 - y1) / (x2 - x1)
+    x3 = l**2 - Mt.A - x1 - x2
+    return x3, l * (x1 - x3) - y1
+
+def mt_double(p):
+    """Double of a point on the Montgomery curve"""
+    if p is None: return None
+    x, y = p
+    if y == GF(0):
+        return None                      # point of order 2
+    l  = (GF(3) * x**2 + GF(2) * Mt.A * x + GF(1)) / (GF(2) * y)
+    x2 = l**2 - Mt.A - GF(2) * x
+    return x2, l * (x - x2) - y
+
+def mt_clear_cofactor(p):
+    """Multiplies p by the cofactor (a power of 2)"""
+    for _ in range(Mt.cofactor.bit_length() - 1):
+        p = mt_double(p)
+    return p
+
+
+##################
+# Montgomery API #
+##################
+# Generic suites, that output Montgomery points.  expand and k come
+# from the curve specific suites.
+def encode_to_montgomery(msg, dst, expand, k):
+    """encode_to_curve(), nonuniform encoding (NU_ suites)"""
+    u, = hash_to_field(msg, 1, dst, expand, k)
+    return mt_clear_cofactor(map_to_curve_elligator2(u))
+
+def hash_to_montgomery(msg, dst, expand, k):
+    """hash_to_curve(), random oracle encoding (RO_ suites)"""
+    u0, u1 = hash_to_field(msg, 2, dst, expand, k)
+    q0     = map_to_curve_elligator2(u0)
+    q1     = map_to_curve_elligator2(u1)
+    return mt_clear_cofactor(mt_add(q0, q1))
+
+
+##############
+# Self tests #
+##############
+# Test vectors from RFC 9380, appendix K (empty message, 32 bytes).
+# The curve specific suites have their own (appendix J).
+expand_vectors = [
+    (expand_message_xmd, hashlib.sha256,
+     b"QUUX-V01-CS02-with-expander-SHA256-128",
+     "68a985b87eb6b46952128911f2a4412bbc302a9d759667f87f7a21d803f07235"),
+    (expand_message_xof, hashlib.shake_256,
+     b"QUUX-V01-CS02-with-expander-SHAKE256",
+     "2ffc05c48ed32b95d72e807f6eab9f7530dd1c2f013914c8fed38c5ccc15ad76"),
+]
+
+def self_test():
+    """Checks the RFC 9380 test vectors, raises ValueError on mismatch"""
+    for expand, hash, dst, expected in expand_vectors:
+        uniform = expand(b"", dst, 32, hash)
+        Checks.verify(uniform.hex() == expected,
+                      'Wrong ' + expand.__name__ + ' test vector')
@@ -51,13 +51,15 @@
 # with this software.  If not, see
 # <https://creativecommons.org/publicdomain/zero/1.0/>
 
-from curve25519 import *
-from elligator import *
-from random    import randrange
-from random    import seed
+from curve25519    import *
+from elligator     import *
+from hash_to_curve import *
+from random        import randrange
+from random        import seed
+import hash_to_curve
 import hashlib
 
-def map_to_curve(random):
+def map_to_curve_ref(random):
     """Maps a uniform random 256 bit number to a curve point
 
     This is compatible with libsodium.
@@ -66,27 +68,188 @@ def map_to_curve(random):
     big hash to reduce it modulo p.  Instead we just chop off one
     bit. The resulting field is close enough to a power of two that the
     deviation from perfect randomness is undetectable.
+
+    Returns an Edwards point in extended coordinates.
+    """
+    y_sign     = random // 2**255         # Get sign of Edwards x coordinate
+    r          = random %  2**255         # Elligator representative
+    u, _       = dir_map(GF(r))           # Ignore Montgomery v coordinate
+    x, y, z, t = to_edwards(u)            # Convert to Edwards
+    if x.to_num() % 2 != y_sign:          # Set sign of Edwards x coordinate
+        x, t = -x, -t
+    point      = (x, y, z, t)
+    return Ed.scalarmult(point, 8)        # Multiply by cofactor
+
+def serialise(x, y):
+    """Serialise an affine Edwards point (y, and the sign of x)"""
+    x_sign = x.to_num() % 2               # Negative means odd here.
+    return y.to_num() + x_sign * 2**255
+
+# Fused map, from the representative straight to Edwards coordinates
+#
+# map_to_curve_ref() costs one inverse square root (the map), one
+# division and one square root (to_edwards()), and one more inversion
+# to serialise the result.  We can do better:
+#
+# - dir_map_fast() gives us v as well as u, and the birational map
+#   gives x = c1 * u / v, y = (u - 1) / (u + 1), where c1 (defined
+#   below) is a square root of -486664.
+#   In projective coordinates, there is no division left.
+# - Either square root of -486664 will do: x only has the right
+#   magnitude, we fix its sign afterwards anyway.
+# - Negating x commutes with the multiplication by the cofactor, so we
+#   can multiply first (three doublings), and fix the sign last.
+# - Fixing the sign needs the affine x of P, and serialising needs the
+#   affine coordinates of 8P.  A single inversion of Z(P) * Z(8P)
+#   gives us both.
+#
+# The only exception is v == 0, which happens when u == 0 (A^2 - 4 is
+# not a square, so there is no other point of order 2).  The result is
+# then (0, -1).  Likewise, A - 2 is not a square, so u + 1 is never 0.
+def map_to_edwards(r):
+    """Edwards point of the representative r (sign of x unspecified)"""
+    u, v   = dir_map_fast(r)
+    up1    = u + GF(1)
+    um1    = u - GF(1)
+    zero   = v == GF(0)                   # Use constant time comparison
+    x      = c1 * u * up1
+    y      = cmove(um1 * v, GF(-1), zero)
+    z      = cmove(up1 * v, GF(1) , zero)
+    t      = c1 * u * um1
+    return x, y, z, t
+
+def map_to_curve_parts(random):
+    """Fused map, up to (but excluding) the final inversion
+
+    Returns (y_sign, x, z, point), where x and z are the projective
+    coordinates of P (before the multiplication by the cofactor), and
+    point is 8P.
+    """
+    y_sign     = random // 2**255
+    r          = random %  2**255
+    p          = map_to_edwards(GF(r))
+    x, _, z, _ = p
+    point      = Ed.double(Ed.double(Ed.double(p)))
+    return y_sign, x, z, point
+
+def map_to_curve_finish(parts, inverse):
+    """Serialises 8P, given the inverse of Z(P) * Z(8P)"""
+    y_sign, x, z, (x8, y8, z8, _) = parts
+    x_sign = (x * z8 * inverse).to_num() % 2  # sign of x in affine P
+    x8     = x8 * z * inverse
+    y8     = y8 * z * inverse
+    x8     = cmove(x8, -x8, x_sign != y_sign)
+    return serialise(x8, y8)
+
+def map_to_curve(random, check=None):
+    """Maps a uniform random 256 bit number to a serialised point"""
+    parts  = map_to_curve_parts(random)
+    _, _, z, (_, _, z8, _) = parts
+    result = map_to_curve_finish(parts, (z * z8).invert())
+    if Checks.enabled(check):
+        x, y, z, _ = map_to_curve_ref(random)
+        Checks.verify(result == serialise(x / z, y / z),
+                      'fused map_to_curve() mismatch')
+    return result
+
+def map_to_curve_batch(randoms):
+    """Same as map_to_curve() for many numbers, with a single inversion"""
+    parts    = [map_to_curve_parts(r) for r in randoms]
+    inverses = batch_invert([z * z8 for _, _, z, (_, _, z8, _) in parts])
+    return [map_to_curve_finish(p, i) for p, i in zip(parts, inverses)]
+
+############
+# RFC 9380 #
+############
+# Suites from RFC 9380 (section 8.5), for Curve25519 and Edwards25519:
+#
+#     curve25519_XMD:SHA-512_ELL2_RO_   hash_to_montgomery(msg, dst)
+#     curve25519_XMD:SHA-512_ELL2_NU_   encode_to_montgomery(msg, dst)
+#     edwards25519_XMD:SHA-512_ELL2_RO_ hash_to_edwards(msg, dst)
+#     edwards25519_XMD:SHA-512_ELL2_NU_ encode_to_edwards(msg, dst)
+#
+# All return affine points.  Unlike map_to_curve(), these take an
+# arbitrary message (bytes, binary file, or iterable of bytes), and a
+# domain separation tag (bytes).
+k      = 128                # security level
+expand = expand_message_xmd # with SHA-512
+
+# Square root of -486664, with sgn0() == 0 (RFC 9380, appendix D.1)
+# Frozen, so importing this module costs no exponentiation (see
+# self_test()).
+c1 = GF(6853475219497561581579357271197624642482790079785650197046958215289687604742)
+
+def mt_to_ed(point):
+    """Rational map from Curve25519 to Edwards25519 (extended coordinates)
+
+    Maps the point at infinity, and the exceptional points (0, 0)
+    and (-1, ...) to the neutral element.
+    """
+    if point is None:
+        return Ed.zero()
+    s, t = point
+    if t == GF(0) or s == GF(-1):
+        return Ed.zero()
+    return Ed.from_affine(c1 * s / t, (s - GF(1)) / (s + GF(1)))
+
+def to_affine(point):
+    x, y, z, _ = point
+    z = z.invert()
+    return x * z, y * z
+
+def hash_to_montgomery(msg, dst):
+    return hash_to_curve.hash_to_montgomery(msg, dst, expand, k)
+
+def encode_to_montgomery(msg, dst):
+    return hash_to_curve.encode_to_montgomery(msg, dst, expand, k)
+
+def hash_to_edwards(msg, dst):
+    u0, u1 = hash_to_field(msg, 2, dst, expand, k)
+    q0     = mt_to_ed(map_to_curve_elligator2(u0))
+    q1     = mt_to_ed(map_to_curve_elligator2(u1))
+    return to_affine(Ed.scalarmult(Ed.add(q0, q1), Mt.cofactor))
+
+def encode_to_edwards(msg, dst):
+    u, = hash_to_field(msg, 1, dst, expand, k)
+    q  = mt_to_ed(map_to_curve_elligator2(u))
+    return to_affine(Ed.scalarmult(q, Mt.cofactor))
+
+
+##############
+# Self tests #
+##############
+# Test vectors from RFC 9380, appendix J (empty message).
+# Each entry: suite, function, x, y (hexadecimal, big endian)
+rfc_vectors = [
+    ("edwards25519_XMD:SHA-512_ELL2_RO_", hash_to_edwards,
+     "3c3da6925a3c3c268448dcabb47ccde5439559d9599646a8260e47b1e4822fc6",
+     "09a6c8561a0b22bef63124c588ce4c62ea83a3c899763af26d795302e115dc21"),
+    ("curve25519_XMD:SHA-512_ELL2_RO_"  , hash_to_montgomery,
+     "2de3780abb67e861289f5749d16d3e217ffa722192d16bbd9d1bfb9d112b98c0",
+     "3b5dc2a498941a1033d176567d457845637554a2fe7a3507d21abd1c1bd6e878"),
+]
+
+def self_test():
+    """Checks c1 and the RFC 9380 test vectors
+
+    Raises ValueError on mismatch.
     """
-    y_sign  = random // 2**255            # Get sign of Edwards x coordinate
-    r       = random %  2**255            # Elligator representative
-    u, _    = dir_map(GF(r))              # Ignore Montgomery v coordinate
-    x, y, z = to_edwards(u)               # Convert to Edwards
-    if x.to_num() % 2 != y_sign: x = -x   # Set sign of Edwards x coordinate
-    x, y, z = Ed.scalarmult((x, y, z), 8) # Multiply by cofactor
-
-    # Serialise Edwards point (divide, get sign of x)
-    z       = z.invert()
-    y       = y * z
-    x       = x * z
-    x_sign  = x.to_num() % 2              # Negative means odd here.
-    point   = y.to_num() + x_sign * 2**255
-    return point
+    root = sqrt(GF(-486664))
+    Checks.verify(c1 == cmove(root, -root, sgn0(root) == 1),
+                  'Wrong constant: c1')
+    hash_to_curve.self_test()
+    for suite, function, x, y in rfc_vectors:
+        dst = b"QUUX-V01-CS02-with-" + suite.encode()
+        px, py = function(b"", dst)
+        Checks.verify(px == GF(int(x, 16)) and py == GF(int(y, 16)),
+                      'Wrong test vector: ' + suite)
 
 # Generate the actual test vectors, print them in stdout.
-seed(12345)  # cheap determinism for the random test vectors
-vectors = []
-for i in range(64):
-    r = randrange(2**256)
-    p = map_to_curve(r)
-    vectors.append(vectors_to_string([r, p]))
-print("\n\n".join(vectors))
+if __name__ == "__main__":
+    seed(12345)  # cheap determinism for the random test vectors
+    vectors = []
+    for i in range(64):
+        r = randrange(2**256)
+        p = map_to_curve(r)
+        vectors.append(vectors_to_string([r, p]))
+    print("\n\n".join(vectors))
@@ -0,0 +1,154 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from curve448      import *
+from elligator     import *
+from hash_to_curve import *
+import curve448
+import hash_to_curve
+
+# Suites from RFC 9380 (section 8.6), for Curve448 and Edwards448:
+#
+#     curve448_XOF:SHAKE256_ELL2_RO_    hash_to_montgomery(msg, dst)
+#     curve448_XOF:SHAKE256_ELL2_NU_    encode_to_montgomery(msg, dst)
+#     edwards448_XOF:SHAKE256_ELL2_RO_  hash_to_edwards(msg, dst)
+#     edwards448_XOF:SHAKE256_ELL2_NU_  encode_to_edwards(msg, dst)
+#
+# All return affine points.  Messages can be bytes, binary files, or
+# iterables of bytes, and the domain separation tag is bytes.
+#
+# Edwards448 is not birationally equivalent to Curve448.  We go from
+# one to the other with the 4-isogeny from RFC 7748.  This requires
+# the standard Ed448 curve (curve448.isogeny == True).
+k      = 224                # security level
+expand = expand_message_xof # with SHAKE256
+
+def mt_to_ed(point):
+    """4-isogeny from Curve448 to Edwards448 (extended coordinates)
+
+    Maps the point at infinity, and the points where the denominators
+    vanish, to the neutral element.
+    """
+    if not curve448.isogeny:
+        raise ValueError('Edwards448 suites need the standard Ed448 curve')
+    if point is None:
+        return Ed.zero()
+    u, v = point
+    u2   = u**2
+    v2   = v**2
+    xn   = GF(4) * v * (u2 - GF(1))
+    xd   = u2**2 - GF(2) * u2 + GF(4) * v2 + GF(1)
+    yn   = -(u2**2 * u - GF(2) * u2 * u - GF(4) * u * v2 + u)
+    yd   = u2**2 * u - GF(2) * u2 * v2 - GF(2) * u2 * u - GF(2) * v2 + u
+    if xd * yd == GF(0):
+        return Ed.zero()
+    return Ed.from_affine(xn / xd, yn / yd)
+
+def serialise(x, y):
+    """Serialise an affine Edwards point (y, and the sign of x)
+
+    Same layout as RFC 8032: the sign of x is the most significant bit
+    of 57 bytes (456 bits), the 448 bits of y are in the low bits.
+    """
+    x_sign = x.to_num() % 2               # Negative means odd here.
+    return y.to_num() + x_sign * 2**455
+
+def to_affine(point):
+    x, y, z, _ = point
+    z = z.invert()
+    return x * z, y * z
+
+def hash_to_montgomery(msg, dst):
+    return hash_to_curve.hash_to_montgomery(msg, dst, expand, k)
+
+def encode_to_montgomery(msg, dst):
+    return hash_to_curve.encode_to_montgomery(msg, dst, expand, k)
+
+def hash_to_edwards(msg, dst):
+    u0, u1 = hash_to_field(msg, 2, dst, expand, k)
+    q0     = mt_to_ed(map_to_curve_elligator2(u0))
+    q1     = mt_to_ed(map_to_curve_elligator2(u1))
+    return to_affine(Ed.scalarmult(Ed.add(q0, q1), Mt.cofactor))
+
+def encode_to_edwards(msg, dst):
+    u, = hash_to_field(msg, 1, dst, expand, k)
+    q  = mt_to_ed(map_to_curve_elligator2(u))
+    return to_affine(Ed.scalarmult(q, Mt.cofactor))
+
+
+##############
+# Self tests #
+##############
+# Test vectors from RFC 9380, appendix J (empty message).
+# Each entry: suite, function, x, y (hexadecimal, big endian)
+rfc_vectors = [
+    ("edwards448_XOF:SHAKE256_ELL2_RO_", hash_to_edwards,
+     "73036d4a88949c032f01507005c133884e2f0d81f9a950826245dda9"
+     "e844fc78186c39daaa7147ead3e462cff60e9c6340b58134480b4d17",
+     "94c1d61b43728e5d784ef4fcb1f38e1075f3aef5e99866911de5a234"
+     "f1aafdc26b554344742e6ba0420b71b298671bbeb2b7736618634610"),
+    ("curve448_XOF:SHAKE256_ELL2_RO_"  , hash_to_montgomery,
+     "5ea5ff623d27c75e73717514134e73e419f831a875ca9e82915fdfc7"
+     "069d0a9f8b532cfb32b1d8dd04ddeedbe3fa1d0d681c01e825d6a9ea",
+     "afadd8de789f8f8e3516efbbe313a7eba364c939ecba00dabf4ced5c"
+     "563b18e70a284c17d8f46b564c4e6ce11784a3825d941116622128c1"),
+]
+
+def self_test():
+    """Checks the RFC 9380 test vectors, raises ValueError on mismatch"""
+    hash_to_curve.self_test()
+    for suite, function, x, y in rfc_vectors:
+        dst = b"QUUX-V01-CS02-with-" + suite.encode()
+        px, py = function(b"", dst)
+        Checks.verify(px == GF(int(x, 16)) and py == GF(int(y, 16)),
+                      'Wrong test vector: ' + suite)
@@ -0,0 +1,166 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import context
+import hashlib
+import secrets
+
+# Hidden key exchange over X25519 and X448 (see key-exchange.txt)
+#
+# Keys and representatives are byte strings, of GF.nb_bytes bytes (32
+# for Curve25519, 56 for Curve448).  Every function takes the name of
+# the curve first, and works on its own context, so both curves can
+# be used in the same process.
+#
+# Low level, deterministic API:
+#     u    = public_key (curve, secret_key)
+#     r    = inverse_map(curve, u, tweak)        # None half of the time
+#     u    = direct_map (curve, r)               # wire bytes -> u
+#
+# High level API:
+#     r, s = key_pair_deterministic(curve, seed) # retries until it works
+#     r, s = key_pair(curve)                     # gathers its own seed
+#     k    = shared_secret (curve, s, r)
+#     ks   = shared_secrets(curve, ss, rs)       # server side, batched
+#
+# The tweak is a random byte:
+# - bit 0 selects the sign of v, to cover the whole curve,
+# - bit 1 selects the sign of the representative,
+# - the remaining bits fill the padding (Curve25519 only).
+#
+# Public keys are computed by co_scalarmult(), whose cross-checks (comb,
+# Montgomery ladder, low order component) cost about 3 times as much as
+# the scalar multiplication itself.  By default only a sample of them
+# are checked (see Checks in core.py).  Set check_level to "full" or
+# "off" to change that, or pass check to public_key().
+
+check_level = "sampled"  # verification level of public_key()
+
+
+#################
+# Low level API #
+#################
+def public_key(curve, secret_key, check=None):
+    """Public key (u) of a secret key, covering the whole curve
+
+    The low order component is selected by the clamped bits of the
+    secret key (method 2 in key-exchange.txt).  check is the
+    verification level (check_level by default).
+    """
+    ctx    = context.load(curve)
+    scalar = int.from_bytes(secret_key, 'little')
+    level  = check_level if check is None else check
+    u      = ctx.co_scalarmult(scalar, scalar % ctx.Mt.cofactor, level)
+    return ctx.encode(u)
+
+def inverse_map(curve, public_key, tweak):
+    """Representative of a public key, or None if it cannot be mapped"""
+    ctx = context.load(curve)
+    u   = ctx.decode(public_key)
+    r   = ctx.rev_map_fast(u, tweak & 1 == 1)
+    if r is None:
+        return None
+    r   = ctx.cmove(r, -r, (tweak >> 1) & 1 == 1)
+    return ctx.encode(r, tweak >> 2)
+
+def direct_map(curve, representative):
+    """Public key (u) of a representative, as received from the wire"""
+    ctx  = context.load(curve)
+    u, _ = ctx.dir_map_fast(ctx.decode(representative))
+    return ctx.encode(u)
+
+
+##################
+# High level API #
+##################
+def key_pair_deterministic(curve, seed):
+    """Hidden key pair (representative, secret_key), from a random seed
+
+    The seed is expanded with SHAKE256 to get the secret key and the
+    tweak of each try.  We retry until the inverse map succeeds (2
+    tries on average).  Leaking the number of tries reveals nothing
+    about the final key pair.
+    """
+    size = context.load(curve).GF.nb_bytes
+    for attempt in range(2**32):
+        stream         = hashlib.shake_256(seed + attempt.to_bytes(4, 'little'))
+        random         = stream.digest(size + 1)
+        secret_key     = random[:size]
+        tweak          = random[size]
+        representative = inverse_map(curve, public_key(curve, secret_key),
+                                     tweak)
+        if representative is not None:
+            return representative, secret_key
+    raise ValueError('Could not generate a key pair')  # never happens
+
+def key_pair(curve):
+    """Hidden key pair (representative, secret_key)"""
+    return key_pair_deterministic(curve, secrets.token_bytes(32))
+
+def shared_secret(curve, secret_key, representative):
+    """Shared secret between our secret key and their representative"""
+    ctx    = context.load(curve)
+    u, _   = ctx.dir_map_fast(ctx.decode(representative))
+    scalar = ctx.clamp(int.from_bytes(secret_key, 'little'))
+    return ctx.encode(ctx.Mt.scalarmult(u, scalar))
+
+def shared_secrets(curve, secret_keys, representatives):
+    """Shared secrets for a batch of incoming representatives
+
+    secret_keys[i] goes with representatives[i].  The ladders run in
+    lockstep, and share a single inversion.
+    """
+    ctx     = context.load(curve)
+    us      = [ctx.dir_map_fast(ctx.decode(r))[0] for r in representatives]
+    scalars = [ctx.clamp(int.from_bytes(s, 'little')) for s in secret_keys]
+    return [ctx.encode(k) for k in ctx.Mt.scalarmult_batch(us, scalars)]
@@ -0,0 +1,388 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+import sys
+
+# collect arguments
+if __name__ == "__main__" and len(sys.argv) < 2:
+    raise ValueError('Usage: limbs.py curve [vectors file]')
+
+# remaining imports
+import context
+import numpy as np
+import time
+
+# Vectorised field arithmetic, for batches of field elements
+#
+# GF works on one element at a time, and each operation goes through
+# the interpreter.  Here a batch of N field elements is stored as a
+# NumPy array of limbs, of shape (number of limbs, N): limb i of every
+# element sits in row i.  Each operation is then a handful of array
+# operations, whatever the size of the batch.
+#
+# Limbs are signed 64-bit integers, so limb products must stay well
+# below 2^63, even after the carries and reductions:
+#
+# - GF(2^255 - 19) uses 10 limbs in radix 2^25.5 (alternating 26 and
+#   25 bits, as in ref10).  2^255 = 19 (mod p).
+# - GF(2^448 - 2^224 - 1) uses 16 limbs of 28 bits.  Radix 2^56
+#   would need 128-bit products, which NumPy doesn't have.
+#   2^448 = 2^224 + 1 (mod p).
+#
+# Every operation returns carried limbs: all of them fit in their
+# width (plus a few units in the limbs that receive the reduction), so
+# they can be fed to the next multiplication.  Comparisons and signs
+# first freeze the limbs into their canonical form (below p).
+#
+# The maps are straight-line transcriptions of dir_map_fast() and
+# rev_map_fast() (see elligator.py), with cmove() done by selection
+# over the whole batch.
+
+layouts = {
+    # p                      : (widths of the limbs, [(limb, factor)])
+    2**255 - 19              : ([26, 25] * 5, [(0, 19)]),
+    2**448 - 2**224 - 1      : ([28] * 16   , [(0, 1), (8, 1)]),
+}
+
+
+###################
+# Limb arithmetic #
+###################
+class Field():
+    """Vectorised arithmetic over the field of a curve context"""
+    def __init__(self, ctx):
+        self.ctx               = ctx
+        self.p                 = ctx.GF.p
+        self.widths, self.fold = layouts[self.p]
+        self.n                 = len(self.widths)
+        self.offsets           = [sum(self.widths[:i])
+                                  for i in range(self.n + 1)]
+        self.bits              = self.offsets[-1]
+        # Limb products do not always land on a limb boundary (radix
+        # 2^25.5): the product of limbs i and j must be scaled by
+        # 2^(o_i + o_j - o_(i+j)) to go into column i+j.
+        offset      = lambda k: (self.offsets[k] if k < self.n else
+                                 self.bits + self.offsets[k - self.n])
+        self.scales = np.array([[2**(self.offsets[i] + self.offsets[j]
+                                     - offset(i + j))
+                                 for j in range(self.n)]
+                                for i in range(self.n)],
+                               dtype=np.int64)[:, :, None]
+        self.uniform = bool((self.scales == 1).all())
+        self.p_limbs = self.constant(self.p, reduce=False)
+
+    # Conversions
+    def constant(self, value, reduce=True):
+        """Limbs of a single value, that broadcast over a batch"""
+        if reduce:
+            value = value % self.p
+        return np.array([[(value >> o) % 2**w]
+                         for o, w in zip(self.offsets, self.widths)],
+                        dtype=np.int64)
+
+    def from_ints(self, values):
+        """Limbs of a list of integers (or GF elements)"""
+        values = [int(v) % self.p for v in values]
+        nb     = (self.bits + 63) // 64 * 8
+        data   = b"".join(v.to_bytes(nb, 'little') for v in values)
+        words  = np.frombuffer(data, dtype='<u8').reshape(len(values), -1)
+        words  = np.concatenate([words.T, np.zeros((1, len(values)),
+                                                   dtype=np.uint64)])
+        limbs  = np.empty((self.n, len(values)), dtype=np.int64)
+        for i, (o, w) in enumerate(zip(self.offsets, self.widths)):
+            word, shift = divmod(o, 64)
+            bits        = words[word] >> np.uint64(shift)
+            if shift + w > 64:
+                bits |= words[word + 1] << np.uint64(64 - shift)
+            limbs[i] = (bits & np.uint64(2**w - 1)).astype(np.int64)
+        return limbs
+
+    def to_ints(self, limbs):
+        """Canonical integers of frozen limbs"""
+        limbs  = self.freeze(limbs)
+        values = [0] * limbs.shape[1]
+        for o, row in zip(self.offsets, limbs.tolist()):
+            values = [v + (x << o) for v, x in zip(values, row)]
+        return values
+
+    # Reduction
+    def carry(self, a):
+        """Brings every limb back to its width (in place)"""
+        for _ in range(2):
+            for i, w in enumerate(self.widths):
+                c     = a[i] >> w
+                a[i] -= c << w
+                if i + 1 < self.n:
+                    a[i + 1] += c
+                else:
+                    for limb, factor in self.fold:
+                        a[limb] += c * factor
+        return a
+
+    def freeze(self, a):
+        """Canonical limbs, in [0, p)"""
+        a = self.carry(a.copy())
+        a = self.carry(a)  # the fold may leave a unit in the low limbs
+        t = a - self.p_limbs
+        for i, w in enumerate(self.widths[:-1]):
+            c         = t[i] >> w
+            t[i]     -= c << w
+            t[i + 1] += c
+        below_p = t[-1] < 0
+        return np.where(below_p, a, t)
+
+    # Arithmetic
+    def add(self, a, b): return self.carry(a + b)
+    def sub(self, a, b): return self.carry(a - b)
+    def neg(self, a   ): return self.carry(-a)
+
+    def mul(self, a, b):
+        n    = self.n
+        size = np.broadcast(a[0], b[0]).shape
+        cols = np.zeros((2 * n - 1,) + size, dtype=np.int64)
+        for i in range(n):
+            bi = b if self.uniform else b * self.scales[i]
+            cols[i:i + n] += a[i] * bi
+        return self.reduce(cols)
+
+    def sqr(self, a):
+        """Same as mul(a, a), with half the limb products"""
+        n    = self.n
+        cols = np.zeros((2 * n - 1,) + a.shape[1:], dtype=np.int64)
+        for i in range(n):
+            ai = a[i:] if self.uniform else a[i:] * self.scales[i, i:]
+            cols[2 * i] += a[i] * ai[0]
+            cols[2 * i + 1:i + n] += (2 * a[i]) * ai[1:]
+        return self.reduce(cols)
+
+    def reduce(self, cols):
+        """Folds the high columns of a product, then carries"""
+        n = self.n
+        for k in reversed(range(n, 2 * n - 1)):
+            for limb, factor in self.fold:
+                cols[k - n + limb] += cols[k] * factor
+        return self.carry(cols[:n])
+
+    def pow(self, a, exponent):
+        """a^exponent, with a fixed window of 4 bits"""
+        table = [None, a]
+        for _ in range(14):
+            table.append(self.mul(table[-1], a))
+        result = None
+        for shift in reversed(range(0, exponent.bit_length(), 4)):
+            if result is not None:
+                for _ in range(4):
+                    result = self.sqr(result)
+            digit = (exponent >> shift) & 15
+            if digit:
+                result = table[digit] if result is None else \
+                         self.mul(result, table[digit])
+        return result
+
+    # Selection and comparisons
+    def cmove(self, a, b, move):
+        """b where move is true, a elsewhere"""
+        return np.where(move, b, a)
+
+    def eq(self, a, b):
+        return (self.freeze(self.sub(a, b)) == 0).all(axis=0)
+
+    def is_negative(self, a):
+        """Same definition as the curve module (see GF.is_negative)"""
+        if self.p == 2**255 - 19:
+            a = self.add(a, a)  # negative iff 2a mod p is odd
+        return self.freeze(a)[0] % 2 == 1
+
+
+########################
+# Inverse square roots #
+########################
+def inv_sqrt(f, x):
+    """Vectorised inv_sqrt() of the curve module"""
+    one = f.constant(1)
+    if f.p == 2**255 - 19:
+        sqrt_m1   = f.constant(f.ctx.sqrt_m1.to_num())
+        isr       = f.pow(x, (f.p - 5) // 8)
+        quartic   = f.mul(x, f.sqr(isr))
+        is_m1     = f.eq(quartic, f.neg(one))
+        m_sqrt_m1 = is_m1 | f.eq(quartic, f.neg(sqrt_m1))
+        is_square = is_m1 | f.eq(quartic, one) | f.eq(x, 0 * one)
+        isr       = f.cmove(isr, f.mul(isr, sqrt_m1), m_sqrt_m1)
+        return isr, is_square
+    isr       = f.pow(x, (f.p - 3) // 4)
+    legendre  = f.mul(x, f.sqr(isr))
+    is_square = ~f.eq(legendre, f.neg(one))
+    return isr, is_square
+
+
+###################
+# Batch Elligator #
+###################
+def dir_map_batch(f, rs):
+    """dir_map_fast() over a list of representatives
+
+    Returns the lists of u and v (integers).
+    """
+    ctx     = f.ctx
+    one     = f.constant(1)
+    A       = f.constant(ctx.A.to_num())
+    Z       = f.constant(ctx.Z.to_num())
+    ufactor = f.constant(ctx.ufactor.to_num())
+    vfactor = f.constant(ctx.vfactor.to_num())
+    r       = f.from_ints(rs)
+    u       = f.sqr(r)
+    t1      = f.mul(u, Z)
+    v       = f.add(t1, one)
+    t2      = f.sqr(v)
+    t3      = f.sqr(A)
+    t3      = f.mul(t3, t1)
+    t3      = f.sub(t3, t2)
+    t3      = f.mul(t3, A)
+    t1      = f.mul(t2, v)
+    t1, is_square = inv_sqrt(f, f.mul(t3, t1))
+    u       = f.mul(u, ufactor)
+    v       = f.mul(r, vfactor)
+    u       = f.cmove(u, one + 0 * u, is_square)
+    v       = f.cmove(v, one + 0 * v, is_square)
+    v       = f.mul(v, t3)
+    v       = f.mul(v, t1)
+    t1      = f.sqr(t1)
+    u       = f.mul(u, f.neg(A))
+    u       = f.mul(u, t3)
+    u       = f.mul(u, t2)
+    u       = f.mul(u, t1)
+    t1      = f.neg(v)
+    v       = f.cmove(v, t1, is_square != f.is_negative(v))
+    return f.to_ints(u), f.to_ints(v)
+
+def rev_map_batch(f, us, v_is_negatives):
+    """rev_map_fast() over lists of u and signs of v
+
+    Returns the list of representatives (integers, None on failure).
+    """
+    ctx    = f.ctx
+    A      = f.constant(ctx.A.to_num())
+    minusZ = f.constant(-ctx.Z.to_num())
+    u      = f.from_ints(us)
+    t      = f.add(u, A)
+    r      = f.mul(minusZ, u)
+    r      = f.mul(r, t)
+    r, is_square = inv_sqrt(f, r)
+    u      = f.cmove(u, t, np.array(v_is_negatives, dtype=bool))
+    r      = f.mul(u, r)
+    t      = f.neg(r)
+    r      = f.cmove(r, t, f.is_negative(r))
+    return [ri if ok else None
+            for ri, ok in zip(f.to_ints(r), is_square.tolist())]
+
+
+################
+# Main program #
+################
+# Checks the batch maps against the scalar ones (random inputs), and
+# against a vector file if one is given:
+#     ./limbs.py curve25519
+#     ./limbs.py curve448 direct ../vectors/curve448_direct.vec
+if __name__ == "__main__":
+    from random import Random
+    import check_vectors
+    curve            = sys.argv[1]
+    ctx              = context.load(curve)
+    ctx.Checks.level = "off"
+    f                = Field(ctx)
+    GF               = ctx.GF
+    rng              = Random(12345)
+    rs               = [rng.randrange(GF.p) for _ in range(4096)] + [0, 1]
+
+    start  = time.perf_counter()
+    points = [ctx.dir_map_fast(GF(r)) for r in rs]
+    scalar = time.perf_counter() - start
+    start  = time.perf_counter()
+    us, vs = dir_map_batch(f, rs)
+    batch  = time.perf_counter() - start
+    ok     = [(GF(u), GF(v)) for u, v in zip(us, vs)] == points
+    print("dir_map: {} ({} points, {:.1f} us scalar, {:.1f} us batch)".format(
+        "OK" if ok else "MISMATCH", len(rs),
+        scalar / len(rs) * 1e6, batch / len(rs) * 1e6))
+
+    signs  = [rng.randrange(2) == 1 for _ in us]
+    start  = time.perf_counter()
+    reps   = [ctx.rev_map_fast(GF(u), s) for u, s in zip(us, signs)]
+    scalar = time.perf_counter() - start
+    start  = time.perf_counter()
+    batch_reps = rev_map_batch(f, us, signs)
+    batch  = time.perf_counter() - start
+    ok     = [None if r is None else GF(r) for r in batch_reps] == reps
+    print("rev_map: {} ({} points, {:.1f} us scalar, {:.1f} us batch)".format(
+        "OK" if ok else "MISMATCH", len(us),
+        scalar / len(us) * 1e6, batch / len(us) * 1e6))
+
+    if len(sys.argv) > 3:
+        vectors, path = sys.argv[2], sys.argv[3]
+        cases = list(check_vectors.read_vectors(path, vectors))
+        if vectors == "direct":
+            us, vs = dir_map_batch(f, [c.r for c in cases])
+            bad    = [c.offset for c, u, v in zip(cases, us, vs)
+                      if (u, v) != (c.u, c.v)]
+        elif vectors == "inverse":
+            reps = rev_map_batch(f, [c.u for c in cases],
+                                 [c.v_is_negative for c in cases])
+            bad  = [c.offset for c, r in zip(cases, reps)
+                    if (r is None) != c.fails or (r is not None and
+                                                  r != c.r)]
+        else:
+            raise ValueError('Only direct and inverse vectors are batched')
+        print("{}: {} test cases, {} mismatches".format(path, len(cases),
+                                                      len(bad)))
+        if bad:
+            sys.exit(1)
@@ -0,0 +1,213 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from collections        import deque
+from concurrent.futures import ProcessPoolExecutor
+from threading          import Event
+from threading          import Lock
+import context
+import secrets
+
+
+####################
+# Hidden key pairs #
+####################
+def key_pairs(curve, count):
+    """Generates count key pairs whose public key can be hidden
+
+    Each key pair is a tuple of integers (secret, c, u, r):
+    - secret: the secret scalar
+    - c     : the cofactor component of the public key (secret % h)
+    - u     : the public key (Montgomery u coordinate)
+    - r     : the representative of the public key
+
+    The inverse map fails for about half of the public keys, so we
+    retry with a new secret until it works.  Every key pair costs 2
+    tries on average, the reservoir below moves that cost elsewhere.
+    Only a sample of the scalar multiplications are cross-checked:
+    full checks would cost about 4 times as much.
+
+    Runs in worker processes, so we return plain integers.
+    """
+    ctx   = context.load(curve)
+    pairs = []
+    while len(pairs) < count:
+        secret        = secrets.randbits(ctx.GF.nb_bytes * 8)
+        c             = secret % ctx.Mt.cofactor
+        u             = ctx.co_scalarmult(secret, c, "sampled")
+        v_is_negative = secrets.randbits(1) == 1  # cover the whole curve
+        r             = ctx.rev_map_fast(u, v_is_negative)
+        if r is not None:
+            pairs.append((secret, c, u.to_num(), r.to_num()))
+    return pairs
+
+
+#############
+# Reservoir #
+#############
+class Reservoir():
+    """Key pairs generated in advance, by a pool of processes
+
+    pop() returns a key pair (secret, c, u, r) in O(1), where u and r
+    are field elements of the curve's context.  When the number of available
+    key pairs falls to the low water mark, the `low` event is set and
+    the reservoir starts refilling itself in the background.  If it
+    ever runs dry, pop() generates a key pair on the spot (a miss).
+
+    Usage:
+        with Reservoir("curve25519", capacity=1024) as reservoir:
+            secret, c, u, r = reservoir.pop()
+    """
+    def __init__(self, curve, capacity=256, low_water=None,
+                 workers=None, batch=16):
+        self.curve     = curve
+        self.ctx       = context.load(curve)
+        self.capacity  = capacity
+        self.low_water = capacity // 4 if low_water is None else low_water
+        self.batch     = batch
+        self.entries   = deque()
+        self.pending   = 0      # key pairs being generated
+        self.hits      = 0      # pop() served from the reservoir
+        self.misses    = 0      # pop() had to generate a key pair
+        self.failures  = 0      # failed background generations
+        self.low       = Event()  # set at the low water mark
+        self.lock      = Lock()
+        self.executor  = ProcessPoolExecutor(workers)
+        self.refill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def pop(self):
+        """Takes a key pair out of the reservoir"""
+        with self.lock:
+            if self.entries:
+                self.hits += 1
+                entry      = self.entries.popleft()
+            else:
+                self.misses += 1
+                entry        = None
+        self.refill()
+        if entry is None:
+            entry = key_pairs(self.curve, 1)[0]
+        secret, c, u, r = entry
+        return secret, c, self.ctx.GF(u), self.ctx.GF(r)
+
+    def refill(self):
+        """Starts generating key pairs if we are at the low water mark
+
+        The batches are reserved (counted as pending) under the lock,
+        so concurrent calls do not submit them twice, but submitted
+        outside of it: a future that is already done runs filled()
+        right away, in this thread.  Batches that cannot be submitted
+        (closed or broken pool) are released, and count as failures.
+        """
+        with self.lock:
+            available = len(self.entries) + self.pending
+            if available > self.low_water:
+                return
+            self.low.set()
+            missing = self.capacity - available
+            counts  = []
+            while missing > 0:
+                counts.append(min(missing, self.batch))
+                missing -= counts[-1]
+            self.pending += sum(counts)
+        for count in counts:
+            try:
+                future = self.executor.submit(key_pairs, self.curve, count)
+            except Exception:
+                with self.lock:
+                    self.pending  -= count
+                    self.failures += 1
+                continue
+            future.add_done_callback(
+                lambda f, count=count: self.filled(f, count))
+
+    def filled(self, future, count):
+        """Adds the key pairs generated in the background"""
+        if future.cancelled():  # by close()
+            with self.lock:
+                self.pending -= count
+            return
+        try:
+            pairs = future.result()
+        except Exception:
+            pairs = []
+        with self.lock:
+            self.pending -= count
+            if len(pairs) < count:
+                self.failures += 1
+            room = self.capacity - len(self.entries)
+            self.entries.extend(pairs[:room])
+            if len(self.entries) > self.low_water:
+                self.low.clear()
+
+    def stats(self):
+        """Hit and miss statistics"""
+        with self.lock:
+            return {"size"    : len(self.entries),
+                    "pending" : self.pending,
+                    "hits"    : self.hits,
+                    "misses"  : self.misses,
+                    "failures": self.failures,
+                    }
@@ -0,0 +1,299 @@
+#! /usr/bin/env python3
+
+# This file is dual-licensed.  Choose whichever licence you want from
+# the two licences listed below.
+#
+# The first licence is a regular 2-clause BSD licence.  The second licence
+# is the CC-0 from Creative Commons. It is intended to release Monocypher
+# to the public domain.  The BSD licence serves as a fallback option.
+#
+# SPDX-License-Identifier: BSD-2-Clause OR CC0-1.0
+#
+# ------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Loup Vaillant
+# All rights reserved.
+#
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ------------------------------------------------------------------------
+#
+# Written in 2026 by Loup Vaillant
+#
+# To the extent possible under law, the author(s) have dedicated all copyright
+# and related neighboring rights to this software to the public domain
+# worldwide.  This software is distributed without any warranty.
+#
+# You should have received a copy of the CC0 Public Domain Dedication along
+# with this software.  If not, see
+# <https://creativecommons.org/publicdomain/zero/1.0/>
+
+from random import Random
+import argparse
+import context
+import math
+import secrets
+import subprocess
+import sys
+import time
+
+# Timing leakage detection, in the style of dudect
+# (Reparaz, Balasch, Verbauwhede, "Dude, is my code constant time?").
+#
+# Each function is called on two classes of inputs: a fixed input, and
+# random inputs.  The class is chosen at random for every call, so any
+# drift of the machine affects both classes the same way.  We then use
+# Welch's t-test to check whether the two timing distributions have the
+# same mean.  A large |t| means the timing depends on the input: a
+# leak.  As in dudect, we also test cropped distributions (measurements
+# above some percentile are discarded) to get rid of the heavy tail.
+#
+# Statistics are computed online (Welford's algorithm), so memory stays
+# bounded no matter how many measurements we take.
+#
+# This Python code is *not* constant time, and this harness will say
+# so.  It is mostly meant for ports of this code.  Those can be tested
+# through a subprocess adapter: the harness writes one input per line
+# (in hexadecimal) to the standard input of the external program, which
+# must process it, then write one line with the time it took (in any
+# unit, typically nanoseconds or cycles).  Timing is done by the
+# program itself, so the pipe does not add noise.
+#
+# Usage:
+#     ./timing.py curve25519 dir_map_fast Mt.scalarmult
+#     ./timing.py curve448 --iterations 1000000
+#     ./timing.py curve25519 --external "./my_port" --size 32
+#
+# The exit status is 1 when at least one function leaks, 0 otherwise.
+
+crops      = [50, 75, 90, 95, 99]  # percentiles of the cropped tests
+warmup     = 1000                  # first measurements, discarded
+thresholds = [(4.5, "no leak detected"),
+              (10 , "possible leak"   ),
+              ]
+
+
+##########################
+# Online Welch's t-tests #
+##########################
+class Welch():
+    """Welch's t-test between two classes, computed online"""
+    def __init__(self):
+        self.n    = [0  , 0  ]
+        self.mean = [0.0, 0.0]
+        self.m2   = [0.0, 0.0]  # sum of squared differences to the mean
+
+    def push(self, cls, x):
+        self.n[cls]    += 1
+        delta           = x - self.mean[cls]
+        self.mean[cls] += delta / self.n[cls]
+        self.m2[cls]   += delta * (x - self.mean[cls])
+
+    def t(self):
+        """t statistic (0 if there are not enough measurements)
+
+        Without any variance, different means are infinitely
+        significant (think of quantized durations).
+        """
+        if min(self.n) < 2:
+            return 0.0
+        v0 = self.m2[0] / (self.n[0] - 1)
+        v1 = self.m2[1] / (self.n[1] - 1)
+        se = math.sqrt(v0 / self.n[0] + v1 / self.n[1])
+        diff = self.mean[0] - self.mean[1]
+        if se == 0:
+            return math.copysign(math.inf, diff) if diff else 0.0
+        return diff / se
+
+class Leakage():
+    """Uncropped and cropped t-tests for one function"""
+    def __init__(self):
+        self.limits = None   # crop limits, known after the warm up
+        self.warmup = []
+        self.tests  = [Welch() for _ in range(len(crops) + 1)]
+
+    def push(self, cls, duration):
+        if self.limits is None:
+            self.warmup.append(duration)
+            if len(self.warmup) == warmup:
+                samples     = sorted(self.warmup)
+                self.limits = [samples[len(samples) * p // 100]
+                               for p in crops]
+                self.warmup = None
+            return
+        self.tests[0].push(cls, duration)
+        for test, limit in zip(self.tests[1:], self.limits):
+            if duration <= limit:
+                test.push(cls, duration)
+
+    def measurements(self):
+        return sum(self.tests[0].n)
+
+    def max_t(self):
+        return max(abs(test.t()) for test in self.tests)
+
+def verdict(t):
+    for threshold, message in thresholds:
+        if t < threshold:
+            return message
+    return "leak"
+
+
+###########
+# Targets #
+###########
+def targets(ctx):
+    """Functions to test: name -> (function, inputs(rng, fixed))
+
+    inputs() returns the arguments of one call.  The fixed class
+    always gets the same arguments.
+    """
+    GF = ctx.GF
+    Mt = ctx.Mt
+    def random_u(rng):
+        return ctx.dir_map_fast(GF(rng.randrange(GF.p)))[0]
+    def scalar(rng, fixed):
+        return 0 if fixed else rng.randrange(2**(GF.nb_bytes * 8))
+    return {
+        "dir_map_fast" : (ctx.dir_map_fast,
+                          lambda rng, fixed:
+                          (GF(0) if fixed else GF(rng.randrange(GF.p)),)),
+        "rev_map_fast" : (ctx.rev_map_fast,
+                          lambda rng, fixed:
+                          (GF(0) if fixed else random_u(rng), False)),
+        "Mt.scalarmult": (Mt.scalarmult,
+                          lambda rng, fixed:
+                          (Mt.base, ctx.clamp(scalar(rng, fixed)))),
+        "co_scalarmult": (ctx.co_scalarmult,
+                          lambda rng, fixed:
+                          (scalar(rng, fixed), 0 if fixed else
+                           rng.randrange(Mt.cofactor), "off")),
+    }
+
+def local(function):
+    """Measures a Python function"""
+    def measure(args):
+        start = time.perf_counter_ns()
+        function(*args)
+        return time.perf_counter_ns() - start
+    return measure
+
+class External():
+    """Measures an external program, through its standard input/output"""
+    def __init__(self, command, size):
+        self.size    = size
+        self.process = subprocess.Popen(command, shell=True, text=True,
+                                        stdin =subprocess.PIPE,
+                                        stdout=subprocess.PIPE)
+
+    def __call__(self, args):
+        data, = args
+        self.process.stdin.write(data.hex() + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise ValueError('External program stopped responding')
+        return float(line)
+
+    def inputs(self, rng, fixed):
+        if fixed:
+            return (bytes(self.size),)
+        return (rng.randbytes(self.size),)
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+###############
+# Measurement #
+###############
+def run(measure, inputs, iterations, batch=1000, seed=None):
+    """Measures iterations calls, returns their Leakage
+
+    Inputs are generated batch by batch, ahead of the measurements.
+    """
+    rng     = Random(seed if seed is not None else secrets.randbits(64))
+    leakage = Leakage()
+    done    = 0
+    while done < iterations + warmup:
+        count   = min(batch, iterations + warmup - done)
+        classes = [rng.randrange(2) for _ in range(count)]
+        calls   = [inputs(rng, cls == 0) for cls in classes]
+        for cls, args in zip(classes, calls):
+            leakage.push(cls, measure(args))
+        done += count
+    return leakage
+
+def report(name, leakage):
+    """Prints the verdict of a function, returns True if it leaks"""
+    t = leakage.max_t()
+    print("{:<16} {:>10} measurements   max |t| {:>8.2f}   {}".format(
+        name, leakage.measurements(), t, verdict(t)))
+    return verdict(t) == "leak"
+
+
+################
+# Main program #
+################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Timing leakage detection')
+    parser.add_argument('curve'       , choices=context.curves)
+    parser.add_argument('targets'     , nargs='*',
+                        help='functions to test (default: all of them)')
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--batch'     , type=int, default=1000)
+    parser.add_argument('--seed'      , type=int)
+    parser.add_argument('--external'  , help='command of an external program')
+    parser.add_argument('--size'      , type=int,
+                        help='input size of the external program, in bytes')
+    args = parser.parse_args()
+
+    if args.external:
+        ctx      = context.load(args.curve)
+        external = External(args.external, args.size or ctx.GF.nb_bytes)
+        try:
+            leakage = run(external, external.inputs,
+                          args.iterations, args.batch, args.seed)
+        finally:
+            external.close()
+        sys.exit(1 if report(args.external, leakage) else 0)
+
+    ctx       = context.load(args.curve)
+    functions = targets(ctx)
+    unknown   = [name for name in args.targets if name not in functions]
+    if unknown:
+        parser.error('unknown targets: ' + ", ".join(unknown) +
+                     ' (choose from ' + ", ".join(functions) + ')')
+    ctx.Checks.level = "off"
+    leaks = 0
+    for name, (function, inputs) in functions.items():
+        if args.targets and name not in args.targets:
+            continue
+        leakage = run(local(function), inputs,
+                      args.iterations, args.batch, args.seed)
+        leaks  += report(name, leakage)
+    sys.exit(1 if leaks else 0)